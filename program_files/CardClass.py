@@ -1,8 +1,9 @@
 import tkinter as tk
+from abc import ABC, abstractmethod
 from tkinter import ttk
 import requests
-import io
-from PIL import Image, ImageTk
+from image_loader import get_image_loader
+from image_memory import get_image_memory
 
 def truncate_text(text, max_length=80):
     """Truncate text to max_length characters and add ellipsis if needed."""
@@ -13,255 +14,204 @@ def truncate_text(text, max_length=80):
         return text
     return text[:max_length-3] + "..."
 
-class Card:
-    def __init__(self, parent, title, score, genres, personal_score, personal_comment, image_url):
+class BaseCard(ABC):
+    """Shared card layout: cover image on the left, text lines on the right."""
+
+    def __init__(self, parent, image_url):
         self.parent = parent
-        self.title = title
-        self.score = score
-        self.genres = genres
-        self.personal_score = personal_score
-        self.personal_comment = personal_comment
         self.image_url = image_url
         self.card_frame = None
         self.img_label = None
-        self.tk_image = None  # Keep reference to prevent garbage collection
-        
-    def create_card(self):
+        self.tk_image = None  # Pinned in the image memory manager while shown
+        self.image_task = None  # Pending background image load, if any
+        self.info_labels = []
+
+    @abstractmethod
+    def display_name(self):
+        """Return the name this card is known by, e.g. in error messages."""
 
+    @abstractmethod
+    def info_lines(self):
+        """Return the text lines shown next to the image; the first one uses the title style."""
+
+    def create_card(self, pack=True):
         # Create a frame for the card with padding and a specific style
         self.card_frame = ttk.Frame(self.parent, padding=10, style='Card.TFrame', width=900, height=180)
-        self.card_frame.pack(pady=5)  # Fixed size card with padding
+        if pack:
+            self.card_frame.pack(pady=5)  # Fixed size card with padding
         self.card_frame.pack_propagate(False)  # Prevent frame from shrinking to fit contents
+        # Cancel the image load however the card goes away, including "Back to Menu"
+        self.card_frame.bind("<Destroy>", self._on_destroy)
 
         # Placeholder for image
         self.img_label = ttk.Label(self.card_frame, anchor='center')
         self.img_label.pack(side=tk.LEFT, padx=10)  # Position on left side with padding
-
-        if self.image_url:
-            try:
-                # Fetch image from URL
-                response = requests.get(self.image_url, stream=True, timeout=10)
-                response.raise_for_status()  # Raise an exception for HTTP errors
-                
-                # Open image using Pillow
-                pil_image = Image.open(io.BytesIO(response.content))
-                
-                # Resize image (e.g., to a fixed height, maintaining aspect ratio)
-                target_height = 150 
-                aspect_ratio = pil_image.width / pil_image.height
-                target_width = int(target_height * aspect_ratio)
-                pil_image = pil_image.resize((target_width, target_height), Image.Resampling.LANCZOS)
-                
-                # Convert to Tkinter PhotoImage
-                self.tk_image = ImageTk.PhotoImage(pil_image)
-                
-                self.img_label.configure(image=self.tk_image)
-                # Keep a reference to prevent garbage collection
-                self.img_label.image = self.tk_image
-            except requests.exceptions.RequestException as e:
-                # Network-related errors
-                print(f"Network error loading image for {self.title}: {e}")
-                self.img_label.configure(text="Network\nError", background="#ffcccc", width=20)
-            except Exception as e:
-                # If image loading fails, show placeholder text
-                print(f"Error loading image for {self.title}: {e}")
-                self.img_label.configure(text="Image\nNot Available", background="#ccc", width=20)
-        else:
-            # No image URL provided, show placeholder
-            self.img_label.configure(text="No Image", background="#ccc", width=20)
+        self.load_image()
 
         # Info frame contains all text information (positioned to right of image)
         info_frame = ttk.Frame(self.card_frame)
         info_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(10, 0))
 
-        # Join the list of genres into a string for display and truncate long text
-        genre_text = ', '.join(self.genres) if isinstance(self.genres, list) else self.genres
-        truncated_title = truncate_text(self.title, 65)
-        truncated_genres = truncate_text(genre_text, 65)
-        truncated_comment = truncate_text(self.personal_comment, 65)
-
         # Add all information labels with controlled text lengths to fit in fixed height
-        title_label = ttk.Label(info_frame, text=f"Title: {truncated_title}", style='CardTitle.TLabel')
-        title_label.pack(anchor='w', pady=(0, 1))
-        
-        score_label = ttk.Label(info_frame, text=f"Score: {self.score}")
-        score_label.pack(anchor='w', pady=(0, 1))
-        
-        genres_label = ttk.Label(info_frame, text=f"Genres: {truncated_genres}")
-        genres_label.pack(anchor='w', pady=(0, 1))
-        
-        personal_score_label = ttk.Label(info_frame, text=f"Your Score: {self.personal_score}")
-        personal_score_label.pack(anchor='w', pady=(0, 1))
-        
-        comment_label = ttk.Label(info_frame, text=f"Comment: {truncated_comment}")
-        comment_label.pack(anchor='w', pady=(0, 1))
+        self.info_labels = []
+        for idx, line in enumerate(self.info_lines()):
+            style = 'CardTitle.TLabel' if idx == 0 else 'TLabel'
+            label = ttk.Label(info_frame, text=line, style=style)
+            label.pack(anchor='w', pady=(0, 1))
+            self.info_labels.append(label)
         # Note: anchor='w' aligns text to the west (left)
-        
+
         return self.card_frame
-    
+
+    def update_card(self, **fields):
+        """Rebind an existing card to different data, reusing its widgets."""
+        image_url = fields.pop('image_url', self.image_url)
+        for name, value in fields.items():
+            setattr(self, name, value)
+        for label, line in zip(self.info_labels, self.info_lines()):
+            label.configure(text=line)
+
+        if image_url != self.image_url or (self.tk_image is None and self.image_task is None):
+            self.release_image()
+            self.image_url = image_url
+            self.load_image()
+
+    def release_image(self):
+        """Stop showing the cover, e.g. when the card scrolls off screen, so its memory can be reclaimed."""
+        if self.image_task:
+            self.image_task.cancel()
+            self.image_task = None
+        if self.tk_image is not None:
+            self.tk_image = None
+            self.img_label.configure(image='')
+            self.img_label.image = None
+            get_image_memory().release(self.image_url)
+
+    def load_image(self):
+        if not self.image_url:
+            # No image URL provided, show placeholder
+            self.img_label.configure(text="No Image", background="#ccc", width=20)
+            return
+
+        photo = get_image_memory().acquire(self.image_url)
+        if photo is not None:
+            self._show_image(photo)  # Still decoded from an earlier visit
+            return
+
+        # Render immediately with a placeholder; the cover fills in once downloaded
+        self.img_label.configure(text="Loading...", background="#eee", width=20)
+        self.image_task = get_image_loader(self.card_frame).load(
+            self.image_url, self._on_image_loaded, self._on_image_error
+        )
+
+    def _on_image_loaded(self, pil_image):
+        self.image_task = None
+        # Convert to Tkinter PhotoImage (must happen on the main thread)
+        self._show_image(get_image_memory().store(self.image_url, pil_image))
+
+    def _show_image(self, photo):
+        self.tk_image = photo
+        self.img_label.configure(image=self.tk_image, text="", background="")
+        # Keep a reference to prevent garbage collection
+        self.img_label.image = self.tk_image
+
+    def _on_image_error(self, error):
+        self.image_task = None
+        if isinstance(error, requests.exceptions.RequestException):
+            # Network-related errors
+            print(f"Network error loading image for {self.display_name()}: {error}")
+            self.img_label.configure(text="Network\nError", background="#ffcccc", width=20)
+        else:
+            # If image loading fails, show placeholder text
+            print(f"Error loading image for {self.display_name()}: {error}")
+            self.img_label.configure(text="Image\nNot Available", background="#ccc", width=20)
+
+    def _on_destroy(self, event):
+        if event.widget is self.card_frame:
+            if self.image_task:
+                self.image_task.cancel()
+                self.image_task = None
+            if self.tk_image is not None:
+                self.tk_image = None
+                get_image_memory().release(self.image_url)
+
     def destroy(self):
         # Destroy the card widget
         if self.card_frame:
             self.card_frame.destroy()
 
 
-class MusicCard:
+class Card(BaseCard):
+    def __init__(self, parent, title, score, genres, personal_score, personal_comment, image_url):
+        super().__init__(parent, image_url)
+        self.title = title
+        self.score = score
+        self.genres = genres
+        self.personal_score = personal_score
+        self.personal_comment = personal_comment
+
+    def display_name(self):
+        return self.title
+
+    def info_lines(self):
+        # Join the list of genres into a string for display and truncate long text
+        genre_text = ', '.join(self.genres) if isinstance(self.genres, list) else self.genres
+        return [
+            f"Title: {truncate_text(self.title, 65)}",
+            f"Score: {truncate_text(self.score)}",
+            f"Genres: {truncate_text(genre_text, 65)}",
+            f"Your Score: {truncate_text(self.personal_score)}",
+            f"Comment: {truncate_text(self.personal_comment, 65)}",
+        ]
+
+
+class MusicCard(BaseCard):
 
     def __init__(self, parent, name, artist, genres, image_url, personal_score, playcount):
-        self.parent = parent
+        super().__init__(parent, image_url)
         self.name = name
         self.artist = artist
         self.genres = genres
-        self.image_url = image_url
         self.personal_score = personal_score
         self.playcount = playcount
-        self.card_frame = None
-        self.img_label = None
-        self.tk_image = None
 
-    def create_card(self):
-        # Create a frame for the card with padding and a specific style
-        self.card_frame = ttk.Frame(self.parent, padding=10, style='Card.TFrame', width=900, height=180)
-        self.card_frame.pack(pady=5)  # Fixed size card with padding
-        self.card_frame.pack_propagate(False)  # Prevent frame from shrinking to fit contents
+    def display_name(self):
+        return self.name
 
-        # Placeholder for image
-        self.img_label = ttk.Label(self.card_frame, anchor='center')
-        self.img_label.pack(side=tk.LEFT, padx=10)
-
-        if self.image_url:
-            try:
-                # Fetch image from URL
-                response = requests.get(self.image_url, stream=True, timeout=10)
-                response.raise_for_status()  # Raise an exception for HTTP errors
-                
-                # Open image using Pillow
-                pil_image = Image.open(io.BytesIO(response.content))
-                
-                # Resize image (e.g., to a fixed height, maintaining aspect ratio)
-                target_height = 150 
-                aspect_ratio = pil_image.width / pil_image.height
-                target_width = int(target_height * aspect_ratio)
-                pil_image = pil_image.resize((target_width, target_height), Image.Resampling.LANCZOS)
-                
-                # Convert to Tkinter PhotoImage
-                self.tk_image = ImageTk.PhotoImage(pil_image)
-                
-                self.img_label.configure(image=self.tk_image)
-                # Keep a reference to prevent garbage collection
-                self.img_label.image = self.tk_image
-            except requests.exceptions.RequestException as e:
-                print(f"Network error loading image for {self.name}: {e}")
-                self.img_label.configure(text="Network\nError", background="#ffcccc", width=20)
-            except Exception as e:
-                print(f"Error loading image for {self.name}: {e}")
-                self.img_label.configure(text="Image\nNot Available", background="#ccc", width=20)
-        else:
-            # No image URL provided, show placeholder
-            self.img_label.configure(text="No Image", background="#ccc", width=20)
-        # Info frame contains all text information (positioned to right of image)
-        info_frame = ttk.Frame(self.card_frame)
-        info_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(10, 0))
+    def info_lines(self):
         # Join the list of genres into a string for display and truncate long text
         genre_text = ', '.join(self.genres) if isinstance(self.genres, list) else self.genres
-        truncated_name = truncate_text(self.name, 65)
-        truncated_artist = truncate_text(self.artist, 65)
-        truncated_genres = truncate_text(genre_text, 65)
-        
-        # Add all information labels with controlled text lengths to fit in fixed height
-        name_label = ttk.Label(info_frame, text=f"Name: {truncated_name}", style='CardTitle.TLabel')
-        name_label.pack(anchor='w', pady=(0, 1))
-        
-        artist_label = ttk.Label(info_frame, text=f"Artist: {truncated_artist}")
-        artist_label.pack(anchor='w', pady=(0, 1))
-        
-        genres_label = ttk.Label(info_frame, text=f"Genres: {truncated_genres}")
-        genres_label.pack(anchor='w', pady=(0, 1))
-        
-        personal_score_label = ttk.Label(info_frame, text=f"Your Score: {self.personal_score}")
-        personal_score_label.pack(anchor='w', pady=(0, 1))
-        
-        playcount_label = ttk.Label(info_frame, text=f"Playcount: {self.playcount}")
-        playcount_label.pack(anchor='w', pady=(0, 1))
-        # Note: anchor='w' aligns text to the west (left)
-        return self.card_frame
-    def destroy(self):
-        # Destroy the card widget
-        if self.card_frame:
-            self.card_frame.destroy()
+        return [
+            f"Name: {truncate_text(self.name, 65)}",
+            f"Artist: {truncate_text(self.artist, 65)}",
+            f"Genres: {truncate_text(genre_text, 65)}",
+            f"Your Score: {truncate_text(self.personal_score)}",
+            f"Playcount: {truncate_text(self.playcount)}",
+        ]
 
 
-class MovieCard:
+class MovieCard(BaseCard):
     def __init__(self, parent, title, score, genres, personal_score, release_date, image_url):
-        self.parent = parent
+        super().__init__(parent, image_url)
         self.title = title
         self.score = score
         self.genres = genres
         self.personal_score = personal_score
         self.release_date = release_date
-        self.image_url = image_url
-        self.card_frame = None
-        self.img_label = None
-        self.tk_image = None
 
-    def create_card(self):
-        self.card_frame = ttk.Frame(self.parent, padding=10, style='Card.TFrame', width=900, height=180)
-        self.card_frame.pack(pady=5) 
-        self.card_frame.pack_propagate(False)  # Prevent frame from shrinking to fit contents
-
-        self.img_label = ttk.Label(self.card_frame, anchor='center')
-        self.img_label.pack(side=tk.LEFT, padx=10)
-
-        if self.image_url:
-            try:
-                response = requests.get(self.image_url, stream=True, timeout=10)
-                response.raise_for_status()
-                pil_image = Image.open(io.BytesIO(response.content))
-                target_height = 150
-                aspect_ratio = pil_image.width / pil_image.height
-                target_width = int(target_height * aspect_ratio)
-                pil_image = pil_image.resize((target_width, target_height), Image.Resampling.LANCZOS)
-                self.tk_image = ImageTk.PhotoImage(pil_image)
-                self.img_label.configure(image=self.tk_image)
-                self.img_label.image = self.tk_image
-            except requests.exceptions.RequestException as e:
-                print(f"Network error loading image for {self.title}: {e}")
-                self.img_label.configure(text="Network\nError", background="#ffcccc", width=20)
-            except Exception as e:
-                print(f"Error loading image for {self.title}: {e}")
-                self.img_label.configure(text="Image\nNot Available", background="#ccc", width=20)
-        else:
-            self.img_label.configure(text="No Image", background="#ccc", width=20)
+    def display_name(self):
+        return self.title
 
-        info_frame = ttk.Frame(self.card_frame)
-        info_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(10, 0))
+    def info_lines(self):
         genre_text = ', '.join(self.genres) if isinstance(self.genres, list) else self.genres
-        
         # Truncate text to ensure all metadata fits within the fixed card height
-        truncated_title = truncate_text(self.title, 65)
-        truncated_genres = truncate_text(genre_text, 65)
-        
-        title_label = ttk.Label(info_frame, text=f"Title: {truncated_title}", style='CardTitle.TLabel')
-        title_label.pack(anchor='w', pady=(0, 1))
-        
-        release_date_label = ttk.Label(info_frame, text=f"Release Date: {self.release_date}")
-        release_date_label.pack(anchor='w', pady=(0, 1))
-        
-        score_label = ttk.Label(info_frame, text=f"Score: {self.score}")
-        score_label.pack(anchor='w', pady=(0, 1))
-        
-        genres_label = ttk.Label(info_frame, text=f"Genres: {truncated_genres}")
-        genres_label.pack(anchor='w', pady=(0, 1))
-        
-        personal_score_label = ttk.Label(info_frame, text=f"Your Score: {self.personal_score}")
-        personal_score_label.pack(anchor='w', pady=(0, 1))
-        
-        return self.card_frame
-
-    def destroy(self):
-        if self.card_frame:
-            self.card_frame.destroy()
+        return [
+            f"Title: {truncate_text(self.title, 65)}",
+            f"Release Date: {truncate_text(self.release_date)}",
+            f"Score: {truncate_text(self.score)}",
+            f"Genres: {truncate_text(genre_text, 65)}",
+            f"Your Score: {truncate_text(self.personal_score)}",
+        ]
 
 class TVCard(MovieCard): # Inherits from MovieCard as they are identical
     pass
-
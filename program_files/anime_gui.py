@@ -1,15 +1,20 @@
 import tkinter as tk          
 from tkinter import ttk       
-import json                   
-import os                    
-import requests 
-import io 
-from PIL import Image, ImageTk # Required for Pillow image processing
 from CardClass import Card  
 from CardClass import MusicCard
 from CardClass import MovieCard
 from CardClass import TVCard
-from entry_manager import EntryManager
+from CardClass import truncate_text
+from virtual_list import VirtualCardList
+from canvas_cards import CanvasCardList
+from menu_art import get_button_image
+from entry_manager import EntryManager, get_pool
+from media_repository import get_repository
+from media_config import CONFIG
+from library_index import get_library_index, query_rows, prepare_text_search, text_search_ready
+from stats_engine import get_stats
+from image_memory import get_image_memory
+from enrichment import get_enrichment_queue
 
 
 FONT = "Sigmar"
@@ -19,85 +24,65 @@ HEADER_SIZE = 20
 SECONDARY_SIZE = 15
 GUI_WIDTH = 1000
 GUI_HEIGHT = 600
+CARD_RENDERER = "canvas"  # "canvas" draws cards as canvas items; "widgets" builds a frame and labels per card
+SEARCH_DELAY_MS = 150  # Pause in typing before the library search box re-filters the cards
+SEARCH_RESULT_LIMIT = 500  # Best text matches shown; ranking every hit is what makes common words slow
 
-# Load anime data from the JSON file, if path doesnt exist return None
-def load_json_data(file_path):
-
-    if not os.path.exists(file_path):
-        return None  # Return None if file doesn't exist
+def count_rows(data, path):
+    """Return the number of entries stored in a media type's data."""
+    if path in ("anime", "manga"):
+        return len(data['names'])
+    elif path == "music":
+        return len(data['name'])
+    return len(data['title'])
 
-    with open(file_path, 'r') as file:
-        return json.load(file)  # Parse JSON and return as Python dictionary
-    
 
-def get_create_card(data, path, parent_frame):
-    cards = []
-    if path == "anime":
-        for i in range(len(data['names'])):
-            card = Card(
-                parent=parent_frame,
-                title=data['names'][i],
-                score=data['scores'][i],
-                genres=data['genres'][i],
-                personal_score=data['personal_scores'][i],
-                personal_comment=data['personal_comments'][i],
-                image_url=data.get('image_url', [None])[i]
-            )
-            card.create_card()
-            cards.append(card)
-    elif path == "manga":
-        for i in range(len(data['names'])):
-            card = Card(
-                parent=parent_frame,
-                title=data['names'][i],
-                score=data['scores'][i],
-                genres=data['genres'][i],
-                personal_score=data['personal_scores'][i],
-                personal_comment=data['personal_comments'][i],
-                image_url=data.get('image_url', [None])[i]
-            )
-            card.create_card()
-            cards.append(card)
+def get_card_row(data, path, i):
+    """Return the card class and constructor fields for entry i, without creating any widgets."""
+    image_url = data['image_url'][i] if 'image_url' in data else None
+    if path in ("anime", "manga"):
+        return Card, dict(
+            title=data['names'][i],
+            score=data['scores'][i],
+            genres=data['genres'][i],
+            personal_score=data['personal_scores'][i],
+            personal_comment=data['personal_comments'][i],
+            image_url=image_url
+        )
     elif path == "music":
-        for i in range(len(data['name'])):
-            card = MusicCard(
-                parent=parent_frame,
-                name=data['name'][i],
-                artist=data['artist'][i],
-                genres=data['genres'][i],
-                personal_score=data['personal_score'][i],
-                image_url=data.get('image_url', [None])[i],
-                playcount=data['playcount'][i]
-            )
-            card.create_card()
-            cards.append(card)
-    elif path == "movie":
-        for i in range(len(data['title'])):
-            card = MovieCard(
-                parent=parent_frame,
-                title=data['title'][i],
-                score=data['score'][i],
-                genres=data['genres'][i],
-                personal_score=data['personal_score'][i],
-                release_date=data['release_date'][i],
-                image_url=data.get('image_url', [None])[i]
-            )
-            card.create_card()
-            cards.append(card)
-    elif path == "tv":
-        for i in range(len(data['title'])):
-            card = TVCard(
-                parent=parent_frame,
-                title=data['title'][i],
-                score=data['score'][i],
-                genres=data['genres'][i],
-                personal_score=data['personal_score'][i],
-                release_date=data['release_date'][i],
-                image_url=data.get('image_url', [None])[i]
-            )
-            card.create_card()
-            cards.append(card)
-    return cards
+        return MusicCard, dict(
+            name=data['name'][i],
+            artist=data['artist'][i],
+            genres=data['genres'][i],
+            personal_score=data['personal_score'][i],
+            image_url=image_url,
+            playcount=data['playcount'][i]
+        )
+    card_class = TVCard if path == "tv" else MovieCard
+    return card_class, dict(
+        title=data['title'][i],
+        score=data['score'][i],
+        genres=data['genres'][i],
+        personal_score=data['personal_score'][i],
+        release_date=data['release_date'][i],
+        image_url=image_url
+    )
+
+
+class CardRows:
+    """Read-only sequence of card rows for a list of (media type, row index) pairs, resolved on access."""
+
+    def __init__(self, data_sources, rows):
+        self.data_sources = data_sources
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, index):
+        path, row = self.rows[index]
+        return get_card_row(self.data_sources[path], path, row)
+
 
 # Function to show the cards screen
 def show_cards_screen(root, data_sources, view_type):
@@ -119,45 +104,195 @@ def show_cards_screen(root, data_sources, view_type):
     )
     back_button.pack(pady=10)
     
-    # Scrollable canvas setup - this allows scrolling if content is larger than window
-    canvas = tk.Canvas(main_frame, borderwidth=0, background="#f0f0f0")
-    frame = ttk.Frame(canvas)  # This frame will hold all the cards
-    scrollbar = ttk.Scrollbar(main_frame, orient="vertical", command=canvas.yview)
-    canvas.configure(yscrollcommand=scrollbar.set)  # Connect scrollbar to canvas
-
-    # Position scrollbar and canvas
-    scrollbar.pack(side="right", fill="y")  # Right side, fill vertically
-    canvas.pack(side="left", fill="both", expand=True)  # Left side, fill all space
-    canvas.create_window((0, 0), window=frame, anchor="nw")  # Place frame inside canvas
-
-    # Function to update the scroll region when the frame size changes
-    def on_frame_configure(event):
-        canvas.configure(scrollregion=canvas.bbox("all"))  # Set scroll region to all content
-
-    frame.bind("<Configure>", on_frame_configure)  # Bind the function to resize events
-    
-    # Create cards for each item in the data, passing the correct parent frame
-    if view_type == 'media':
-        # For 'media', we combine movie and tv data
-        movies_data = data_sources.get('movie')
-        tv_data = data_sources.get('tv')
-        
-        all_cards = []
-        if movies_data:
-            all_cards.extend(get_create_card(movies_data, 'movie', frame))
-        if tv_data:
-            all_cards.extend(get_create_card(tv_data, 'tv', frame))
-        
-        frame.cards = all_cards
-        if not all_cards:
-            ttk.Label(frame, text="No data available for movies or TV shows.").pack()
+    # For 'media', we combine movie and tv data
+    media_types = ['movie', 'tv'] if view_type == 'media' else [view_type]
+    if not any(count_rows(data_sources[path], path) for path in media_types):
+        empty_message = "No data available for movies or TV shows." if view_type == 'media' else f"No data available for {view_type}."
+        ttk.Label(main_frame, text=empty_message).pack()
+        return
+
+    # Sort and genre filter controls; both are answered from library_index without rescanning the data
+    toolbar = ttk.Frame(main_frame)
+    toolbar.pack(fill=tk.X, padx=10, pady=(0, 10))
+
+    sort_labels = [label for label in CONFIG[media_types[0]]['sort_fields']
+                   if all(label in CONFIG[path]['sort_fields'] for path in media_types)]
+    sort_var = tk.StringVar(value="Date added")
+    descending_var = tk.BooleanVar(value=False)
+    genre_vars = {}
+
+    ttk.Label(toolbar, text="Sort by", font=(FONT, SIZE)).pack(side=tk.LEFT)
+    sort_box = ttk.Combobox(toolbar, textvariable=sort_var, values=["Date added"] + sort_labels,
+                            state="readonly", width=14)
+    sort_box.pack(side=tk.LEFT, padx=5)
+    ttk.Checkbutton(toolbar, text="Descending", variable=descending_var,
+                    command=lambda: apply_view()).pack(side=tk.LEFT, padx=5)
+
+    genre_button = ttk.Menubutton(toolbar, text="Genres")
+    genre_menu = tk.Menu(genre_button, tearoff=False)
+    genre_button["menu"] = genre_menu
+    genre_button.pack(side=tk.LEFT, padx=5)
+
+    genre_counts = {}
+    for path in media_types:
+        for genre, count in get_library_index(path).genre_counts():
+            genre_counts[genre] = genre_counts.get(genre, 0) + count
+    genre_menu.add_command(label="Clear genres", command=lambda: clear_genres())
+    genre_menu.add_separator()
+    for genre, count in sorted(genre_counts.items(), key=lambda item: (-item[1], item[0])):
+        genre_vars[genre] = tk.BooleanVar(value=False)
+        genre_menu.add_checkbutton(label=f"{genre} ({count})", variable=genre_vars[genre],
+                                   command=lambda: apply_view())
+
+    count_label = ttk.Label(toolbar, text="", font=(FONT, SIZE))
+    count_label.pack(side=tk.RIGHT)
+
+    # Fuzzy search over titles, artists and genres, re-run after a short pause in typing
+    search_var = tk.StringVar()
+    search_entry = ttk.Entry(toolbar, textvariable=search_var, width=24)
+    search_entry.pack(side=tk.RIGHT, padx=5)
+    ttk.Label(toolbar, text="Search", font=(FONT, SIZE)).pack(side=tk.RIGHT)
+    pending_search = [None]
+
+    def on_search_typed(event=None):
+        if pending_search[0]:
+            root.after_cancel(pending_search[0])
+        pending_search[0] = root.after(SEARCH_DELAY_MS, apply_view)
+
+    search_entry.bind("<KeyRelease>", on_search_typed)
+
+    # The trigram index takes seconds to build for a large library, so it is built off the main thread
+    # while the user looks at the cards; a search typed before it is ready runs once it is
+    def on_text_index_ready(_result):
+        if search_var.get().strip():
+            apply_view()
+
+    index_task = get_pool(root, "text-index", 1).submit(prepare_text_search, media_types,
+                                                        on_done=on_text_index_ready)
+    main_frame.bind("<Destroy>", lambda event: index_task.cancel())
+
+    def selected_rows():
+        sort_label = sort_var.get() if sort_var.get() in sort_labels else None
+        genres = [genre for genre, var in genre_vars.items() if var.get()]
+        text = search_var.get().strip()
+        # "Date added" in descending order means newest first; text matches are ranked by relevance
+        rows = query_rows(media_types, sort_label, descending_var.get(), genres, text, limit=SEARCH_RESULT_LIMIT)
+        if sort_label is None and not text and descending_var.get():
+            rows.reverse()
+        return rows, genres
+
+    def apply_view():
+        pending_search[0] = None
+        if search_var.get().strip() and not text_search_ready(media_types):
+            count_label.config(text="Indexing...")
+            return
+        rows, genres = selected_rows()
+        genre_button.config(text=f"Genres ({len(genres)})" if genres else "Genres")
+        count_label.config(text=f"{len(rows)} entries")
+        # Only the visible rows ever get widgets
+        main_frame.card_list.set_rows(CardRows(data_sources, rows))
 
+    def clear_genres():
+        for var in genre_vars.values():
+            var.set(False)
+        apply_view()
+
+    sort_box.bind("<<ComboboxSelected>>", lambda event: apply_view())
+
+    # Insertion order (oldest first) until the user picks something else
+    rows, _ = selected_rows()
+    count_label.config(text=f"{len(rows)} entries")
+    if CARD_RENDERER == "canvas":
+        main_frame.card_list = CanvasCardList(main_frame, CardRows(data_sources, rows),
+                                              title_font=(FONT, 14, "bold"), text_font=(FONT, SIZE))
     else:
-        data_to_show = data_sources.get(view_type)
-        if data_to_show:
-            frame.cards = get_create_card(data_to_show, view_type, frame)
-        else:
-            ttk.Label(frame, text=f"No data available for {view_type}.").pack()
+        main_frame.card_list = VirtualCardList(main_frame, CardRows(data_sources, rows))
+
+
+def draw_histogram(parent, counts, edges, width=360, height=140):
+    """Bar chart of a score histogram on a plain canvas."""
+    canvas = tk.Canvas(parent, width=width, height=height, background="white", highlightthickness=0)
+    tallest = max(counts) or 1
+    bar_width = (width - 20) / len(counts)
+    for i, count in enumerate(counts):
+        x = 10 + i * bar_width
+        bar_height = (height - 30) * count / tallest
+        canvas.create_rectangle(x + 2, height - 20 - bar_height, x + bar_width - 2, height - 20,
+                                fill="#4a78c2", outline="")
+        if count:
+            canvas.create_text(x + bar_width / 2, height - 26 - bar_height, text=str(count), font=(FONT, 7))
+        canvas.create_text(x + bar_width / 2, height - 10, text=f"{edges[i]:g}", font=(FONT, 7))
+    return canvas
+
+
+def show_stats_tab(tab, media_type):
+    """Fill one notebook tab with the statistics of a media type."""
+    stats = get_stats(media_type)
+
+    def fmt(value):
+        return "-" if value is None else f"{value:.2f}"
+
+    lines = [f"{stats['entries']} entries, mean personal score {fmt(stats['mean_personal'])}"]
+    if 'mean_public' in stats:
+        lines.append(f"Mean public score {fmt(stats['mean_public'])}, "
+                     f"you score {fmt(stats['mean_delta'])} points relative to the public on average")
+        if stats['most_underrated']:
+            lines.append("You like more than most: " + ", ".join(
+                f"{truncate_text(title, 25)} (+{delta:.1f})" for title, delta in stats['most_underrated'][:3]))
+        if stats['most_overrated']:
+            lines.append("You like less than most: " + ", ".join(
+                f"{truncate_text(title, 25)} ({delta:.1f})" for title, delta in stats['most_overrated'][:3]))
+    for line in lines:
+        ttk.Label(tab, text=line, font=(FONT, SIZE)).pack(anchor="w", padx=10)
+
+    charts = ttk.Frame(tab)
+    charts.pack(fill=tk.X, padx=10, pady=5)
+    ttk.Label(charts, text="Personal scores", font=(FONT, SIZE)).grid(column=0, row=0)
+    draw_histogram(charts, stats['personal_histogram'], stats['histogram_edges']).grid(column=0, row=1, padx=5)
+    if 'public_histogram' in stats:
+        ttk.Label(charts, text="Public scores", font=(FONT, SIZE)).grid(column=1, row=0)
+        draw_histogram(charts, stats['public_histogram'], stats['histogram_edges']).grid(column=1, row=1, padx=5)
+
+    tables = ttk.Frame(tab)
+    tables.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+    breakdowns = [("Genre", stats['genres'])]
+    breakdowns.append(("Artist", stats['artists']) if media_type == 'music' else ("Year", stats['years']))
+    for column, (label, table) in enumerate(breakdowns):
+        tree = ttk.Treeview(tables, columns=("entries", "mean"), height=8)
+        tree.heading("#0", text=label)
+        tree.heading("entries", text="Entries")
+        tree.heading("mean", text="Mean score")
+        tree.column("entries", width=70, anchor="e")
+        tree.column("mean", width=90, anchor="e")
+        for name, entries, mean in table:
+            tree.insert("", tk.END, text=str(name), values=(entries, fmt(mean)))
+        tree.grid(column=column, row=0, sticky="nsew", padx=5)
+        tables.columnconfigure(column, weight=1)
+
+
+def show_stats_screen(root, data_sources):
+    """Per media type statistics, one notebook tab each."""
+    for widget in root.winfo_children():
+        widget.destroy()
+
+    main_frame = ttk.Frame(root)
+    main_frame.pack(fill=tk.BOTH, expand=True)
+    ttk.Button(main_frame, text="Back to Menu", command=lambda: show_menu_screen(root, data_sources)).pack(pady=10)
+
+    try:
+        import numpy  # Only checked here; stats_engine imports it on first use
+    except ImportError:
+        ttk.Label(main_frame, text="Statistics need NumPy (pip install numpy).").pack()
+        return
+
+    notebook = ttk.Notebook(main_frame)
+    notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+    for media_type in CONFIG:
+        tab = ttk.Frame(notebook)
+        notebook.add(tab, text="TV" if media_type == 'tv' else media_type.capitalize())
+        show_stats_tab(tab, media_type)
+
+    ttk.Label(main_frame, text=get_image_memory().describe(), font=(FONT, SIZE)).pack(pady=(0, 10))
 
 
 def show_menu_screen(root, data_sources):
@@ -180,11 +315,8 @@ def show_menu_screen(root, data_sources):
     button_frame = ttk.Frame(root)
     button_frame.pack()
 
-    # --- Load and resize images for buttons ---
+    # --- Load the pre-scaled button images (built once per session) ---
     try:
-        # Store image references on the frame itself to prevent garbage collection
-        button_frame.image_refs = []
-
         # Define button configurations
         button_configs = [
             {"text": "Anime", "image_path": "../assets/anime.png", "view_type": "anime"},
@@ -194,9 +326,7 @@ def show_menu_screen(root, data_sources):
         ]
 
         for config in button_configs:
-            img = Image.open(config["image_path"]).resize((200, 250), Image.Resampling.LANCZOS)
-            photo = ImageTk.PhotoImage(img)
-            button_frame.image_refs.append(photo)  # Keep a reference
+            photo = get_button_image(config["image_path"])
 
             ttk.Button(
                 button_frame,
@@ -220,7 +350,14 @@ def show_menu_screen(root, data_sources):
         text="Add New Entry",
         command=lambda: show_entry_screen(root, data_sources)
     )
-    add_button.pack(pady=20)
+    add_button.pack(pady=(20, 5))
+
+    stats_button = ttk.Button(
+        root,
+        text="Statistics",
+        command=lambda: show_stats_screen(root, data_sources)
+    )
+    stats_button.pack()
 
 
 def show_entry_screen(root, data_sources):
@@ -230,17 +367,10 @@ def show_entry_screen(root, data_sources):
     # Create entry manager instance
     entry_manager = EntryManager(root, FONT, SECONDARY_SIZE)
     
-    # Set up back callback to return to menu and refresh data
+    # Set up back callback to return to menu; data_sources reads through the shared repository,
+    # which already holds any new additions
     def back_to_menu():
-        # Reload data sources to reflect any new additions
-        updated_data_sources = {
-            "anime": load_json_data("../statistics/anime_stats.txt"),
-            "manga": load_json_data("../statistics/manga_stats.txt"),
-            "music": load_json_data("../statistics/music_stats.txt"),
-            "movie": load_json_data("../statistics/movie_stats.txt"),
-            "tv": load_json_data("../statistics/tv_stats.txt")
-        }
-        show_menu_screen(root, updated_data_sources)
+        show_menu_screen(root, data_sources)
     
     entry_manager.set_back_callback(back_to_menu)
     
@@ -269,17 +399,14 @@ def show_gui():
     style.configure("Card.TFrame", background="white", relief="raised", borderwidth=1)
     style.configure("CardTitle.TLabel", font=(FONT, 14, "bold"))
     
-    # Load all data sources into a single dictionary
-    data_sources = {
-        "anime": load_json_data("../statistics/anime_stats.txt"),
-        "manga": load_json_data("../statistics/manga_stats.txt"),
-        "music": load_json_data("../statistics/music_stats.txt"),
-        "movie": load_json_data("../statistics/movie_stats.txt"),
-        "tv": load_json_data("../statistics/tv_stats.txt")
-    }
+    # Data sources load lazily: on first access to a view, or in the background once the menu is up
+    repository = get_repository()
+    data_sources = repository.data_sources()
     
     # Start with the menu screen
     show_menu_screen(root, data_sources)
+    root.after_idle(repository.preload_in_background)
+    root.after_idle(get_enrichment_queue().start, root)  # Finish enrichments left over from the last session
     
     # Start the Tkinter event loop
     root.mainloop()  
@@ -0,0 +1,215 @@
+"""
+Binary Snapshot Module
+Compact, memory-mapped copy of a media type's JSON snapshot, kept alongside it.
+
+Every cell is stored exactly as the JSON holds it (a JSON-encoded UTF-8 blob indexed by a uint32 offset
+array), so a mapped load returns the same values and types as parsing the JSON. Number columns also get a
+fixed-width float64 array of their parsed values, with NaN as the null sentinel, for vectorized readers.
+Loading maps the file and decodes cells only when they are read, so opening a large library costs
+neither a JSON parse nor memory for boxed Python objects. The JSON snapshot stays the source of truth;
+the binary copy records the JSON file's (mtime, size) and is rebuilt whenever they no longer match. It
+also records the JSON file's SHA-256 digest, which the journal store uses to tie a journal to its snapshot
+without reading the JSON.
+
+Layout: MAGIC, uint32 header length, JSON header, then 8-byte aligned column sections.
+"""
+
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import MutableSequence
+from media_values import parse_number
+
+MAGIC = b"MDSNAP03"  # Bumped when the layout changes, so older copies are rebuilt
+BINARY_SUFFIX = ".bin"
+OFFSET_TYPE = "I"  # uint32 cell offsets
+
+
+def binary_path(snapshot_path):
+    return os.path.splitext(snapshot_path)[0] + BINARY_SUFFIX
+
+
+def source_signature(snapshot_path):
+    stat = os.stat(snapshot_path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _data_start(header_length):
+    start = len(MAGIC) + 4 + header_length
+    return start + -start % 8
+
+
+# Reading
+class _MappedColumn:
+    """Read-only view of one column; cells are decoded on access."""
+
+    def __init__(self, offsets, blob, length, numbers=None):
+        self.length = length
+        self.offsets = offsets.cast(OFFSET_TYPE)
+        self.blob = blob
+        self.numbers = numbers.cast("d") if numbers is not None else None
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        if not 0 <= index < self.length:
+            raise IndexError(index)
+        return json.loads(str(self.blob[self.offsets[index]:self.offsets[index + 1]], "utf-8"))
+
+
+class OverlayColumn(MutableSequence):
+    """A mapped column that accepts the journal's appends and updates without copying the base.
+
+    A delete copies the column into a plain list first, since every later row shifts.
+    """
+
+    def __init__(self, base):
+        self._base = base
+        self._changed = {}  # Row -> value written over the mapped one
+        self._tail = []  # Rows appended after the snapshot
+        self._list = None  # Set once a delete made the column a plain list
+
+    def __len__(self):
+        if self._list is not None:
+            return len(self._list)
+        return len(self._base) + len(self._tail)
+
+    def mapped_numbers(self):
+        """Return (float64 view of the mapped rows, {row: value} for rows changed or appended since),
+        or None if the column has no number array or was turned into a plain list."""
+        if self._list is not None or self._base.numbers is None:
+            return None
+        changed = dict(self._changed)
+        changed.update((len(self._base) + i, value) for i, value in enumerate(self._tail))
+        return self._base.numbers, changed
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if self._list is not None:
+            return self._list[index]
+        if index < 0:
+            index += len(self)
+        if index in self._changed:
+            return self._changed[index]
+        if index >= len(self._base):
+            return self._tail[index - len(self._base)]
+        return self._base[index]
+
+    def __setitem__(self, index, value):
+        if self._list is not None:
+            self._list[index] = value
+            return
+        if index < 0:
+            index += len(self)
+        if index >= len(self._base):
+            self._tail[index - len(self._base)] = value
+        elif 0 <= index:
+            self._changed[index] = value
+        else:
+            raise IndexError(index)
+
+    def __delitem__(self, index):
+        if self._list is None:
+            self._list = list(self)
+        del self._list[index]
+
+    def insert(self, index, value):
+        if self._list is None and index >= len(self):
+            self._tail.append(value)
+            return
+        if self._list is None:
+            self._list = list(self)
+        self._list.insert(index, value)
+
+
+def read_binary(snapshot_path):
+    """Return (mapped columnar data, JSON snapshot digest) if a current binary snapshot exists, else None."""
+    path = binary_path(snapshot_path)
+    try:
+        signature = source_signature(snapshot_path)
+        with open(path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (FileNotFoundError, ValueError, OSError):
+        return None  # No snapshot yet, or an empty file that cannot be mapped
+
+    view = memoryview(mapped)
+    try:
+        if bytes(view[:len(MAGIC)]) != MAGIC:
+            return None
+        (header_length,) = struct.unpack_from("<I", mapped, len(MAGIC))
+        start = len(MAGIC) + 4
+        header = json.loads(bytes(view[start:start + header_length]))
+    except (struct.error, ValueError):
+        return None
+    if header.get("source") != signature or header.get("byteorder") != sys.byteorder:
+        return None  # The JSON changed since this copy was written
+
+    data_start = _data_start(header_length)
+
+    def section(spec):
+        return view[data_start + spec[0]:data_start + spec[0] + spec[1]]
+
+    rows = header["rows"]
+    data = {}
+    for column in header["columns"]:
+        numbers = section(column["numbers"]) if "numbers" in column else None
+        base = _MappedColumn(section(column["offsets"]), section(column["blob"]), rows, numbers)
+        data[column["name"]] = OverlayColumn(base)
+    return data, header["snapshot_digest"]
+
+
+# Writing
+def _cell_sections(values):
+    offsets, blob = array(OFFSET_TYPE, [0]), bytearray()
+    for value in values:
+        blob += json.dumps(value).encode("utf-8")
+        offsets.append(len(blob))
+    return offsets.tobytes(), bytes(blob)
+
+
+def write_binary(data, snapshot_path, number_fields, snapshot_digest):
+    """Write the binary copy of data, which must match the JSON snapshot at snapshot_path (whose file
+    digest is snapshot_digest)."""
+    rows = len(next(iter(data.values()), []))
+    sections = []  # (column spec, key, bytes) in file order
+    columns = []
+    for name, values in data.items():
+        if len(values) != rows:
+            raise ValueError(f"column {name} has {len(values)} rows, expected {rows}")
+        column = {"name": name}
+        columns.append(column)
+        offsets, blob = _cell_sections(values)
+        sections += [(column, "offsets", offsets), (column, "blob", blob)]
+        if name in number_fields:
+            numbers = (parse_number(value) for value in values)
+            sections.append((column, "numbers", array("d", (math.nan if n is None else n for n in numbers)).tobytes()))
+
+    # Section positions are relative to the 8-byte aligned start of the data after the header
+    position = 0
+    for column, key, payload in sections:
+        position += -position % 8  # Keeps float arrays aligned
+        column[key] = [position, len(payload)]
+        position += len(payload)
+    header = {"source": source_signature(snapshot_path), "byteorder": sys.byteorder, "rows": rows,
+              "snapshot_digest": snapshot_digest, "columns": columns}
+    header_bytes = json.dumps(header).encode("utf-8")
+    data_start = _data_start(len(header_bytes))
+
+    path = binary_path(snapshot_path)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(MAGIC + struct.pack("<I", len(header_bytes)) + header_bytes)
+        for column, key, payload in sections:
+            file.write(b"\0" * (data_start + column[key][0] - file.tell()))
+            file.write(payload)
+    try:
+        os.replace(tmp_path, path)
+    except PermissionError:
+        # Windows refuses to replace a file that is still mapped; the next start rebuilds it
+        os.remove(tmp_path)
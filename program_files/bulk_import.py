@@ -0,0 +1,166 @@
+"""
+Bulk Import Module
+Adds many entries at once from a CSV or JSONL file of (media_type, query or id, personal_score) rows.
+
+Rows are resolved concurrently (the rate limiter keeps each provider within its limits) and every
+media type's stats are written once at the end. Progress is recorded next to the input file, so an
+interrupted import resumes where it stopped.
+
+Usage: python bulk_import.py library.csv [--fresh] [--workers N]
+
+CSV files need a header with media_type, personal_score and query and/or id columns; JSONL files use
+the same keys. id is a MyAnimeList id for anime/manga and a TMDB id for movie/tv.
+"""
+
+import argparse
+import csv
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from media_config import CONFIG
+from id_index import normalize_id_value
+from media_repository import get_repository
+import media_core
+from media_core import build_entry, format_result
+
+MAX_WORKERS = 8
+RETRYABLE_STATUSES = {"error"}  # Rows with these statuses are attempted again on resume
+
+
+def read_rows(file_path):
+    """Yield (row_number, row_dict) from a CSV or JSONL file."""
+    with open(file_path, 'r', newline='', encoding='utf-8') as file:
+        if file_path.lower().endswith(('.jsonl', '.ndjson')):
+            for number, line in enumerate(file, start=1):
+                if line.strip():
+                    yield number, json.loads(line)
+        else:
+            for number, row in enumerate(csv.DictReader(file), start=2):  # Line 1 is the header
+                yield number, row
+
+
+def _result_title(media_type, result):
+    if media_type == 'music':
+        return result.get('name')
+    if media_type == 'tv':
+        return result.get('name') or result.get('title')
+    return result.get('title')
+
+
+def resolve_row(row):
+    """Resolve one input row to a stats entry; returns a progress record."""
+    media_type = (row.get('media_type') or '').strip().lower()
+    query = (row.get('query') or '').strip()
+    item_id = str(row.get('id') or '').strip()
+    personal_score = str(row.get('personal_score') or '').strip()
+
+    if media_type not in CONFIG:
+        return {"status": "unresolved", "message": f"unknown media type '{media_type}'"}
+    if not personal_score:
+        return {"status": "unresolved", "message": "missing personal score"}
+
+    if item_id:
+        if media_type == 'music':
+            return {"status": "unresolved", "message": "music rows must use a query, not an id"}
+        details = media_core.get_details_by_id(media_type, item_id)
+    elif query:
+        results = media_core.search(media_type, query)
+        if not results:
+            return {"status": "unresolved", "message": f"no results for '{query}'"}
+        # A single result, or a single exact title match, is unambiguous
+        exact = [r for r in results if normalize_id_value(_result_title(media_type, r)) == normalize_id_value(query)]
+        if len(results) == 1:
+            chosen = results[0]
+        elif len(exact) == 1:
+            chosen = exact[0]
+        else:
+            candidates = [format_result(media_type, r) for r in (exact or results)[:5]]
+            return {"status": "ambiguous", "message": f"'{query}' matches several items", "candidates": candidates}
+        details = media_core.get_details(media_type, chosen)
+    else:
+        return {"status": "unresolved", "message": "row needs a query or an id"}
+
+    if not details:
+        # Network failures are worth retrying on the next run
+        return {"status": "error", "message": "could not retrieve details"}
+    return {"status": "resolved", "media_type": media_type, "entry": build_entry(media_type, details, personal_score)}
+
+
+def load_progress(progress_path):
+    """Return {row_number: record} from an earlier, interrupted run."""
+    progress = {}
+    if os.path.exists(progress_path):
+        with open(progress_path, 'r', encoding='utf-8') as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Torn last line from the interruption
+                progress[record["row"]] = record
+    return progress
+
+
+def bulk_import(file_path, fresh=False, max_workers=MAX_WORKERS):
+    progress_path = f"{file_path}.progress.jsonl"
+    if fresh and os.path.exists(progress_path):
+        os.remove(progress_path)
+    progress = load_progress(progress_path)
+    if progress:
+        print(f"Resuming: {len(progress)} rows already processed")
+
+    rows = [(number, row) for number, row in read_rows(file_path)
+            if number not in progress or progress[number]["status"] in RETRYABLE_STATUSES]
+
+    with open(progress_path, 'a', encoding='utf-8') as progress_file, \
+            ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(resolve_row, row): (number, row) for number, row in rows}
+        for future in as_completed(futures):
+            number, row = futures[future]
+            try:
+                record = future.result()
+            except Exception as e:
+                record = {"status": "error", "message": str(e)}
+            record.update(row=number, query=row.get('query') or row.get('id'))
+            progress[number] = record
+            # Flushed per row so an interruption never loses resolved work
+            progress_file.write(json.dumps(record) + "\n")
+            progress_file.flush()
+            print(f"Row {number}: {record['status']}")
+
+    # One batched write per media type, covering rows resolved by this run and any interrupted one
+    by_type = {}
+    for record in progress.values():
+        if record["status"] == "resolved":
+            by_type.setdefault(record["media_type"], []).append(record["entry"])
+    repository = get_repository()
+    for media_type, entries in by_type.items():
+        added, updated = repository.add_many(media_type, entries)
+        print(f"{media_type}: {added} added, {updated} updated")
+
+    for record in progress.values():
+        if record["status"] == "resolved":
+            record["status"] = "imported"  # Written now, so a retry run must not write it again
+
+    problems = sorted((r for r in progress.values() if r["status"] != "imported"), key=lambda r: r["row"])
+    for record in problems:
+        print(f"Row {record['row']} ({record.get('query')}): {record['status']} - {record['message']}")
+        for candidate in record.get("candidates", []):
+            print(f"    candidate: {candidate}")
+
+    if any(record["status"] in RETRYABLE_STATUSES for record in problems):
+        with open(progress_path, 'w', encoding='utf-8') as progress_file:
+            for record in progress.values():
+                progress_file.write(json.dumps(record) + "\n")
+        print(f"Some rows failed; run again to retry them (progress kept in {progress_path})")
+    else:
+        os.remove(progress_path)
+    return progress
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import entries from a CSV or JSONL file.")
+    parser.add_argument("file", help="CSV or JSONL file with media_type, query/id and personal_score")
+    parser.add_argument("--fresh", action="store_true", help="ignore progress from an interrupted run")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS, help="concurrent lookups")
+    args = parser.parse_args()
+    bulk_import(args.file, fresh=args.fresh, max_workers=args.workers)
@@ -0,0 +1,180 @@
+"""
+Canvas Cards Module
+Draws cards as rectangle, image and text items on the list's single canvas instead of building a
+frame and labels per card. What each card shows comes from a per-card-type schema, and item groups
+are recycled while scrolling just like the widget cards in VirtualCardList.
+"""
+
+import requests
+from CardClass import Card, MusicCard, MovieCard, truncate_text
+from image_loader import get_image_loader
+from image_memory import get_image_memory
+from virtual_list import VirtualCardList, CARD_PADDING, OFFSCREEN_Y
+
+CARD_WIDTH = 900
+CARD_HEIGHT = 180
+IMAGE_SLOT = (20, 10, 170, 170)  # Left, top, right, bottom of the cover area inside a card
+TEXT_X = 190
+TITLE_LINE_HEIGHT = 28
+LINE_HEIGHT = 22
+_UNBOUND = object()  # image_url of a slot that has not shown any row yet
+
+# (label, field, max length) per line, in display order; the first line uses the title font.
+# Matches the text of the widget cards' info_lines.
+CARD_SCHEMAS = {
+    Card: [
+        ("Title", "title", 65), ("Score", "score", None), ("Genres", "genres", 65),
+        ("Your Score", "personal_score", None), ("Comment", "personal_comment", 65),
+    ],
+    MusicCard: [
+        ("Name", "name", 65), ("Artist", "artist", 65), ("Genres", "genres", 65),
+        ("Your Score", "personal_score", None), ("Playcount", "playcount", None),
+    ],
+    MovieCard: [
+        ("Title", "title", 65), ("Release Date", "release_date", None), ("Score", "score", None),
+        ("Genres", "genres", 65), ("Your Score", "personal_score", None),
+    ],
+}
+
+
+def schema_for(card_class):
+    for cls in card_class.__mro__:  # TVCard uses the MovieCard schema
+        if cls in CARD_SCHEMAS:
+            return CARD_SCHEMAS[cls]
+    raise KeyError(card_class)
+
+
+def schema_lines(schema, fields):
+    lines = []
+    for label, field, max_length in schema:
+        value = fields.get(field)
+        if isinstance(value, list):
+            value = ', '.join(value)
+        lines.append(f"{label}: {truncate_text(value, max_length or 80)}")
+    return lines
+
+
+class CanvasSlot:
+    """The canvas items drawing one card, rebound to another row when it scrolls out of view."""
+
+    def __init__(self, canvas, line_count, title_font, text_font):
+        self.canvas = canvas
+        self.image_task = None
+        self.photo = None  # Pinned in the image memory manager while drawn
+        self.image_url = _UNBOUND
+        left, top, right, bottom = IMAGE_SLOT
+        self.background = canvas.create_rectangle(0, 0, CARD_WIDTH, CARD_HEIGHT, fill="white", outline="#c8c8c8")
+        self.placeholder = canvas.create_rectangle(left, top, right, bottom, fill="#eee", outline="")
+        self.placeholder_text = canvas.create_text((left + right) / 2, (top + bottom) / 2, text="", justify="center")
+        self.image = canvas.create_image((left + right) / 2, (top + bottom) / 2, anchor="center")
+        self.lines = [
+            canvas.create_text(TEXT_X, 0, anchor="nw", font=title_font if i == 0 else text_font)
+            for i in range(line_count)
+        ]
+        self.items = [self.background, self.placeholder, self.placeholder_text, self.image] + self.lines
+
+    def move_to(self, y):
+        # Every item is positioned relative to the card's top-left corner
+        left, top, right, bottom = IMAGE_SLOT
+        self.canvas.coords(self.background, 0, y, CARD_WIDTH, y + CARD_HEIGHT)
+        self.canvas.coords(self.placeholder, left, y + top, right, y + bottom)
+        self.canvas.coords(self.placeholder_text, (left + right) / 2, y + (top + bottom) / 2)
+        self.canvas.coords(self.image, (left + right) / 2, y + (top + bottom) / 2)
+        line_y = y + 15
+        for i, item in enumerate(self.lines):
+            self.canvas.coords(item, TEXT_X, line_y)
+            line_y += TITLE_LINE_HEIGHT if i == 0 else LINE_HEIGHT
+
+    def bind(self, lines, image_url):
+        for item, line in zip(self.lines, lines):
+            self.canvas.itemconfigure(item, text=line)
+        if image_url != self.image_url or (self.photo is None and self.image_task is None):
+            self.release_image()
+            self.image_url = image_url
+            self.load_image()
+
+    def load_image(self):
+        if not self.image_url:
+            self._show_placeholder("No Image", "#ccc")
+            return
+        photo = get_image_memory().acquire(self.image_url)
+        if photo is not None:
+            self._show_image(photo)
+            return
+        self._show_placeholder("Loading...", "#eee")
+        url = self.image_url
+        self.image_task = get_image_loader(self.canvas).load(
+            url,
+            lambda pil_image: self._on_image_loaded(url, pil_image),
+            lambda error: self._on_image_error(url, error)
+        )
+
+    def _show_placeholder(self, text, color):
+        self.canvas.itemconfigure(self.placeholder, fill=color, state="normal")
+        self.canvas.itemconfigure(self.placeholder_text, text=text, state="normal")
+
+    def _on_image_loaded(self, url, pil_image):
+        self.image_task = None
+        if url != self.image_url:
+            return  # Rebound to another row since this load started
+        self._show_image(get_image_memory().store(url, pil_image))
+
+    def _show_image(self, photo):
+        self.photo = photo
+        self.canvas.itemconfigure(self.image, image=self.photo)
+        self.canvas.itemconfigure(self.placeholder, state="hidden")
+        self.canvas.itemconfigure(self.placeholder_text, state="hidden")
+
+    def _on_image_error(self, url, error):
+        self.image_task = None
+        if url != self.image_url:
+            return
+        if isinstance(error, requests.exceptions.RequestException):
+            print(f"Network error loading image {url}: {error}")
+            self._show_placeholder("Network\nError", "#ffcccc")
+        else:
+            print(f"Error loading image {url}: {error}")
+            self._show_placeholder("Image\nNot Available", "#ccc")
+
+    def release_image(self):
+        """Stop drawing the cover so the image memory manager may reclaim it."""
+        if self.image_task:
+            self.image_task.cancel()
+            self.image_task = None
+        if self.photo is not None:
+            self.photo = None
+            self.canvas.itemconfigure(self.image, image="")
+            get_image_memory().release(self.image_url)
+
+
+class CanvasCardList(VirtualCardList):
+    """Drop-in replacement for VirtualCardList that draws cards as canvas items."""
+
+    def __init__(self, parent, rows, title_font=("Sigmar", 14, "bold"), text_font=("Sigmar", 10), **kwargs):
+        self.title_font = title_font
+        self.text_font = text_font
+        super().__init__(parent, rows, **kwargs)
+        self.canvas.bind("<Destroy>", self._on_destroy, add="+")
+
+    def _bind(self, index):
+        card_class, fields = self.rows[index]
+        schema = schema_for(card_class)
+        idle = self.pool.get(len(schema))
+        slot = idle.pop() if idle else CanvasSlot(self.canvas, len(schema), self.title_font, self.text_font)
+        slot.move_to(index * self.row_height + CARD_PADDING)
+        slot.bind(schema_lines(schema, fields), fields.get('image_url'))
+        self.visible[index] = slot
+
+    def _release(self, index):
+        slot = self.visible.pop(index)
+        slot.release_image()
+        slot.move_to(OFFSCREEN_Y)
+        self.pool.setdefault(len(slot.lines), []).append(slot)
+
+    def _on_destroy(self, event):
+        if event.widget is self.canvas:
+            for slot in self.visible.values():
+                if slot.image_task:
+                    slot.image_task.cancel()
+                if slot.photo is not None:
+                    get_image_memory().release(slot.image_url)  # The canvas items are already gone
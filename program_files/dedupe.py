@@ -0,0 +1,21 @@
+"""
+Collapse duplicate entries already stored in the stats files.
+Rows are matched on each media type's CONFIG id_fields; the first position is kept with the
+most recently added values.
+
+Usage: python dedupe.py [media_type ...]
+"""
+
+import sys
+from media_config import CONFIG
+from storage import get_store
+
+
+def dedupe_all(media_types):
+    for media_type in media_types:
+        removed = get_store(media_type).dedupe()
+        print(f"{media_type}: removed {removed} duplicate entr{'y' if removed == 1 else 'ies'}")
+
+
+if __name__ == "__main__":
+    dedupe_all(sys.argv[1:] or list(CONFIG))
@@ -0,0 +1,118 @@
+"""
+Enrichment Module
+Fills in the fields a search result lacks (Last.fm tags and playcount, TMDB genres) after an entry
+was fast-added from it, by fetching the details on a worker thread and patching the stored row back on
+the Tk main thread, where every other repository write happens.
+
+Pending jobs are kept on disk, so entries added just before the app closed are enriched on the next run.
+"""
+
+import json
+import os
+import threading
+from media_config import CONFIG
+from media_repository import get_repository
+from media_values import known_values
+from tk_worker import TkWorkerPool
+import media_core
+
+PENDING_PATH = "../cache/enrichment_pending.jsonl"
+
+
+class EnrichmentQueue:
+    def __init__(self, pending_path=PENDING_PATH):
+        self.pending_path = pending_path
+        self._pending = {}  # Job key -> job, mirrored to pending_path
+        self._lock = threading.Lock()
+        self._pool = None  # One worker, so jobs run in the order they were queued
+
+    def enqueue(self, root, media_type, item, entry):
+        """Schedule details for search result item to be merged into the stored entry."""
+        job = {"media_type": media_type, "item": item, "entry": entry}
+        with self._lock:
+            self._pending[self._job_key(job)] = job
+            self._save_pending()
+        if self._pool is not None and self._pool.root is root:
+            self._submit(job)
+        else:
+            self.start(root)  # Submits every pending job, this one included
+
+    def start(self, root):
+        """Start the worker for this window, picking up jobs left over from an earlier session."""
+        if self._pool is not None and self._pool.root is root:
+            return
+        self._pool = TkWorkerPool(root, max_workers=1, name="enrichment")
+        with self._lock:
+            jobs = list(self._pending.values())
+            for job in self._load_pending():
+                key = self._job_key(job)
+                if key not in self._pending:
+                    self._pending[key] = job
+                    jobs.append(job)
+        for job in jobs:
+            self._submit(job)
+
+    def _submit(self, job):
+        # Failed jobs stay in the pending file and are retried on the next start
+        self._pool.submit(self._fetch_patch, job,
+                          on_done=lambda patch: self._apply(job, patch),
+                          on_error=lambda e: print(f"Error enriching entry: {e}"))
+
+    @staticmethod
+    def _fetch_patch(job):
+        """Worker thread: the fields to merge into the stored entry, or None if details are unavailable."""
+        media_type, entry = job["media_type"], job["entry"]
+        details = media_core.get_details(media_type, job["item"])
+        if not details:
+            return None
+        conf = CONFIG[media_type]
+        full = media_core.build_entry(media_type, details, entry[conf['personal_score_field']])
+        # Id fields and the user's own score are never overwritten
+        return {
+            field: value for field, value in known_values(full).items()
+            if field not in conf['id_fields'] and field != conf['personal_score_field']
+        }
+
+    def _apply(self, job, patch):
+        """Main thread: patch the stored entry, so views and listeners never see a write mid-iteration."""
+        if patch is None:
+            return
+        repository = get_repository()
+        index = repository.find(job["media_type"], job["entry"])
+        if index is not None and patch:  # None: the entry was removed in the meantime
+            repository.update(job["media_type"], index, patch)
+        with self._lock:
+            self._pending.pop(self._job_key(job), None)
+            self._save_pending()
+
+    @staticmethod
+    def _job_key(job):
+        fields = CONFIG[job["media_type"]]['id_fields']
+        return json.dumps([job["media_type"]] + [job["entry"].get(field) for field in fields])
+
+    def _load_pending(self):
+        if not os.path.exists(self.pending_path):
+            return []
+        jobs = []
+        with open(self.pending_path, 'r', encoding='utf-8') as file:
+            for line in file:
+                try:
+                    jobs.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        return jobs
+
+    def _save_pending(self):
+        os.makedirs(os.path.dirname(self.pending_path), exist_ok=True)
+        tmp_path = f"{self.pending_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            for job in self._pending.values():
+                file.write(json.dumps(job) + "\n")
+        os.replace(tmp_path, self.pending_path)
+
+
+_enrichment_queue = EnrichmentQueue()
+
+
+def get_enrichment_queue():
+    return _enrichment_queue
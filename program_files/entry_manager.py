@@ -5,56 +5,44 @@ Handles all entry-related functionality for adding new media items.
 
 import tkinter as tk
 from tkinter import ttk, messagebox
-import requests
-import json
-import os
-import copy
-import api_keys
-
-# Configuration for different media types
-CONFIG = {
-    "music": {
-        "file_path": "../statistics/music_stats.txt",
-        "data_structure": {
-            "name": [], "artist": [], "genres": [], "image_url": [],
-            "personal_score": [], "playcount": []
-        },
-        "id_fields": ["artist", "name"]
-    },
-    "anime": {
-        "file_path": "../statistics/anime_stats.txt",
-        "data_structure": {
-            "names": [], "scores": [], "genres": [], "personal_scores": [],
-            "personal_comments": [], "image_url": []
-        },
-        "id_fields": ["names"]
-    },
-    "manga": {
-        "file_path": "../statistics/manga_stats.txt",
-        "data_structure": {
-            "names": [], "scores": [], "genres": [], "personal_scores": [],
-            "personal_comments": [], "image_url": []
-        },
-        "id_fields": ["names"]
-    },
-    "movie": {
-        "file_path": "../statistics/movie_stats.txt",
-        "data_structure": {
-            "title": [], "personal_score": [], "score": [], "genres": [],
-            "release_date": [], "image_url": []
-        },
-        "id_fields": ["title", "release_date"]
-    },
-    "tv": {
-        "file_path": "../statistics/tv_stats.txt",
-        "data_structure": {
-            "title": [], "personal_score": [], "score": [], "genres": [],
-            "release_date": [], "image_url": []
-        },
-        "id_fields": ["title", "release_date"]
-    }
+from media_core import (search, peek_search, get_details, peek_details, search_payload_complete,
+                        format_result, build_entry)
+from enrichment import get_enrichment_queue
+from media_repository import get_repository
+from media_values import known_values
+from tk_worker import TkWorkerPool
+
+SUGGEST_DELAY_MS = 300  # Wait for a pause in typing before searching
+SUGGEST_MIN_CHARS = 3
+SEARCH_WORKERS = 5  # Enough for the "All" mode to query every provider at once
+PREFETCH_COUNT = 3  # Details fetched ahead for the top results of each media type
+PREFETCH_WORKERS = 2  # Kept small so prefetching never crowds out searches
+
+# Providers queried by the "All" search and the header shown above each one's results; the groups
+# appear in the order the providers answer, not in this order
+MEDIA_LABELS = {
+    'anime': "Anime",
+    'manga': "Manga",
+    'music': "Music",
+    'movie': "Movie",
+    'tv': "TV Show"
 }
 
+_pools = {}  # Pool name -> TkWorkerPool bound to the current root window
+
+
+def get_pool(root, name, max_workers):
+    """Return the named worker pool for this window, creating it on first use."""
+    pool = _pools.get(name)
+    if pool is None or pool.root is not root:
+        pool = _pools[name] = TkWorkerPool(root, max_workers=max_workers, name=name)
+    return pool
+
+
+def get_search_pool(root):
+    return get_pool(root, "search", SEARCH_WORKERS)
+
+
 class EntryManager:
     def __init__(self, root, font="Sigmar", size=15):
         self.root = root
@@ -62,218 +50,131 @@ class EntryManager:
         self.size = size
         
         # State variables
-        self.search_results = []
+        self.search_results = []  # Listbox rows as (media_type, result); None for group headers
+        self.search_task = None  # Single-provider search still running
+        self.fanout_tasks = {}  # Media type -> provider search still running for the "All" mode
+        self.prefetch_tasks = []  # Speculative detail fetches for the results on screen
         self.selected_item = None
         self.current_media_type = ""
         self.current_personal_score = ""
         self.back_callback = None
+        self.suggestions = []
+        self.suggest_after_id = None  # Pending debounce timer
+        self.suggest_task = None  # In-flight live search
+        self.suggest_generation = 0  # Bumped per query so superseded results are discarded
         
         # UI elements
         self.selected_et = None
         self.name_inp = None
         self.score_inp = None
         self.results_listbox = None
+        self.suggest_listbox = None
 
     def set_back_callback(self, callback):
         """Set the callback function for the back button"""
         self.back_callback = callback
 
-    # Data handling functions
-    def load_json_data(self, file_path, default_structure):
-        """Return persisted stats or a fresh copy of the configured structure."""
-        if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
-            return copy.deepcopy(default_structure)
-
-        try:
-            with open(file_path, 'r') as file:
-                return json.load(file)
-        except (json.JSONDecodeError, FileNotFoundError):
-            # Fall back to a clean template if the file is corrupt or missing mid-read.
-            return copy.deepcopy(default_structure)
-
-    def store_json_data(self, data, file_path):
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, 'w') as file:
-            json.dump(data, file, indent=4)
-        print(f"Data successfully stored in {file_path}")
-
-    # API search functions
-    def search_anime(self, query):
-        url = "https://api.jikan.moe/v4/anime"
-        params = {'q': query, 'limit': 10}
-        try:
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            return data.get('data', [])
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching anime data: {e}")
-            return []
-
-    def search_manga(self, query):
-        url = "https://api.jikan.moe/v4/manga"
-        params = {'q': query, 'limit': 10}
-        try:
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            return data.get('data', [])
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching manga data: {e}")
-            return []
-
-    def search_music(self, query):
-        params = {
-            'method': 'album.search', 'album': query, 'api_key': api_keys.MUSIC_API,
-            'format': 'json', 'limit': 10
-        }
-        try:
-            response = requests.get('http://ws.audioscrobbler.com/2.0/', params=params)
-            response.raise_for_status()
-            data = response.json()
-            return data.get('results', {}).get('albummatches', {}).get('album', [])
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching music data: {e}")
-            return []
-
-    def search_media(self, query, media_type):
-        headers = {"Authorization": api_keys.MOVIE_API}
-        url = f"https://api.themoviedb.org/3/search/{media_type}"
-        params = {'query': query, 'language': 'en-US', 'page': 1}
-        try:
-            response = requests.get(url, params=params, headers=headers)
-            response.raise_for_status()
-            data = response.json()
-            return data.get('results', [])
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching {media_type} data: {e}")
-            return []
-
-    # API detail functions
-    def get_anime_details(self, anime_id):
-        url = f"https://api.jikan.moe/v4/anime/{anime_id}"
-        try:
-            response = requests.get(url)
-            response.raise_for_status()
-            data = response.json()
-            return data.get('data')
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching anime details: {e}")
-            return None
-
-    def get_manga_details(self, manga_id):
-        url = f"https://api.jikan.moe/v4/manga/{manga_id}"
-        try:
-            response = requests.get(url)
-            response.raise_for_status()
-            data = response.json()
-            return data.get('data')
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching manga details: {e}")
-            return None
-
-    def get_music_details(self, artist, album):
-        params = {
-            'method': 'album.getinfo', 'artist': artist, 'album': album,
-            'api_key': api_keys.MUSIC_API, 'format': 'json'
-        }
-        try:
-            response = requests.get('http://ws.audioscrobbler.com/2.0/', params=params)
-            response.raise_for_status()
-            data = response.json()
-            return data.get('album')
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching music details: {e}")
-            return None
-
-    def get_media_details(self, media_id, media_type):
-        headers = {"Authorization": api_keys.MOVIE_API}
-        url = f"https://api.themoviedb.org/3/{media_type}/{media_id}"
-        try:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching {media_type} details: {e}")
-            return None
+    # Search-as-you-type
+    def on_query_changed(self, event=None):
+        # Debounce: restart the timer on every keystroke
+        if self.suggest_after_id:
+            self.root.after_cancel(self.suggest_after_id)
+        self.suggest_after_id = self.root.after(SUGGEST_DELAY_MS, self.run_suggestions)
+
+    def run_suggestions(self):
+        self.suggest_after_id = None
+        media_type = self.selected_et.get()
+        query = self.name_inp.get().strip()
+        self.suggest_generation += 1
+        generation = self.suggest_generation
+        if self.suggest_task:
+            self.suggest_task.cancel()  # Its results would be stale anyway
+            self.suggest_task = None
+
+        if len(query) < SUGGEST_MIN_CHARS or media_type == 'all':
+            self.show_suggestions(generation, media_type, [])
+            return
+        cached = peek_search(media_type, query)
+        if cached is not None:
+            # Typing back to an earlier query is answered straight from the response cache
+            self.show_suggestions(generation, media_type, cached)
+            return
+        self.suggest_task = get_search_pool(self.root).submit(
+            search, media_type, query,
+            on_done=lambda results: self.show_suggestions(generation, media_type, results)
+        )
+
+    def show_suggestions(self, generation, media_type, results):
+        if generation != self.suggest_generation:
+            return  # A newer query has been issued since this one
+        self.suggest_task = None
+        self.suggestions = [(media_type, result) for result in results]
+        self.suggest_listbox.delete(0, tk.END)
+        for result in results:
+            self.suggest_listbox.insert(tk.END, format_result(media_type, result))
+
+    def cancel_suggestions(self, event=None):
+        if self.suggest_after_id:
+            self.root.after_cancel(self.suggest_after_id)
+            self.suggest_after_id = None
+        if self.suggest_task:
+            self.suggest_task.cancel()
+            self.suggest_task = None
+        self.suggest_generation += 1
+
+    def on_suggestion_selected(self, event=None):
+        selection = self.suggest_listbox.curselection()
+        if not selection:
+            return
+        self.current_personal_score = self.score_inp.get()
+        if not self.current_personal_score:
+            messagebox.showerror("Error", "Please enter a personal score")
+            return
+        self.current_media_type, self.selected_item = self.suggestions[selection[0]]
+        self.cancel_suggestions()
+        self.process_selected_item()
 
     # UI event handlers
     def on_item_selected(self):
         selection = self.results_listbox.curselection()
-        if selection:
-            self.selected_item = self.search_results[selection[0]]
+        if selection and self.search_results[selection[0]] is not None:
+            self.current_media_type, self.selected_item = self.search_results[selection[0]]
             self.process_selected_item()
 
     def process_selected_item(self):
-        # Resolve detailed payloads before we persist anything.
-        details = None
-        if self.current_media_type == 'anime':
-            details = self.get_anime_details(self.selected_item['mal_id'])
-        elif self.current_media_type == 'manga':
-            details = self.get_manga_details(self.selected_item['mal_id'])
-        elif self.current_media_type == 'music':
-            details = self.get_music_details(self.selected_item['artist'], self.selected_item['name'])
-        elif self.current_media_type == 'movie':
-            details = self.get_media_details(self.selected_item['id'], 'movie')
-        elif self.current_media_type == 'tv':
-            details = self.get_media_details(self.selected_item['id'], 'tv')
-        
-        if not details:
-            messagebox.showerror("Error", "Could not retrieve details for the selected item")
-            return
-        
-        # Load existing data and append new data
-        conf = CONFIG[self.current_media_type]
-        data = self.load_json_data(conf['file_path'], conf['data_structure'])
-        
-        if self.current_media_type == 'anime':
-            data['names'].append(details.get('title', 'N/A'))
-            data['scores'].append(details.get('score', 'N/A'))
-            data['genres'].append([g['name'] for g in details.get('genres', [])])
-            data['personal_scores'].append(self.current_personal_score)
-            data['personal_comments'].append(details.get('year' , 'N/A'))
-            data['image_url'].append(details.get('images', {}).get('jpg', {}).get('image_url', ''))
+        # Use the search payload when it is complete, or details already prefetched into the cache.
+        # Otherwise add straight from the search payload and fill in the rest in the background.
+        if search_payload_complete(self.current_media_type):
+            details = self.selected_item
+        else:
+            details = peek_details(self.current_media_type, self.selected_item)
+        needs_enrichment = details is None
+        if needs_enrichment:
+            details = self.selected_item
         
-        elif self.current_media_type == 'manga':
-            data['names'].append(details.get('title', 'N/A'))
-            data['scores'].append(details.get('score', 'N/A'))
-            data['genres'].append([g['name'] for g in details.get('genres', [])])
-            data['personal_scores'].append(self.current_personal_score)
-            data['personal_comments'].append(details['published'].get('from' , 'N/A')[:4])
-            data['image_url'].append(details.get('images', {}).get('jpg', {}).get('image_url', ''))
+        entry = build_entry(self.current_media_type, details, self.current_personal_score)
         
-        elif self.current_media_type == 'music':
-            data['name'].append(details.get('name', 'N/A'))
-            data['artist'].append(details.get('artist', 'N/A'))
-            data['genres'].append([t['name'] for t in details.get('tags', {}).get('tag', [])])
-            image = next((img['#text'] for img in reversed(details.get('image', [])) if img.get('#text')), '')
-            data['image_url'].append(image)
-            data['personal_score'].append(self.current_personal_score)
-            data['playcount'].append(details.get('playcount', '0'))
-        
-        elif self.current_media_type == 'movie':
-            data['title'].append(details.get('title', 'N/A'))
-            data['personal_score'].append(self.current_personal_score)
-            data['score'].append(details.get('vote_average', 'N/A'))
-            data['genres'].append([g['name'] for g in details.get('genres', [])])
-            data['release_date'].append(details.get('release_date', 'N/A'))
-            poster_path = details.get('poster_path', '')
-            data['image_url'].append(f"https://image.tmdb.org/t/p/w500{poster_path}" if poster_path else '')
-
-        elif self.current_media_type == 'tv':
-            title = details.get('name') or details.get('title', 'N/A')
-            data['title'].append(title)
-            data['personal_score'].append(self.current_personal_score)
-            data['score'].append(details.get('vote_average', 'N/A'))
-            data['genres'].append([g['name'] for g in details.get('genres', [])])
-            data['release_date'].append(details.get('first_air_date', 'N/A'))
-            poster_path = details.get('poster_path', '')
-            data['image_url'].append(f"https://image.tmdb.org/t/p/w500{poster_path}" if poster_path else '')
-        
-        # Store the updated data
-        self.store_json_data(data, conf['file_path'])
+        # Store the new entry, or update the existing one if it is already in the library
+        repository = get_repository()
         media_label = "TV Show" if self.current_media_type == 'tv' else self.current_media_type.capitalize()
-        messagebox.showinfo("Success", f"{media_label} added successfully!")
+        existing_index = repository.find(self.current_media_type, entry)
+        if existing_index is not None:
+            if not messagebox.askyesno(
+                "Already Added",
+                f"This {media_label} is already in your library.\nUpdate the existing entry instead?"
+            ):
+                return
+            if needs_enrichment:
+                # Keep the stored genres etc. until enrichment brings the real values
+                repository.update(self.current_media_type, existing_index, known_values(entry))
+            else:
+                repository.update(self.current_media_type, existing_index, entry)
+            messagebox.showinfo("Success", f"{media_label} updated successfully!")
+        else:
+            repository.add(self.current_media_type, entry)
+            messagebox.showinfo("Success", f"{media_label} added successfully!")
+        if needs_enrichment:
+            get_enrichment_queue().enqueue(self.root, self.current_media_type, self.selected_item, entry)
         
         # Go back to previous screen
         if self.back_callback:
@@ -292,38 +193,97 @@ class EntryManager:
             messagebox.showerror("Error", "Please enter a personal score")
             return
         
-        # Search based on media type
-        results = []
-        display_results = []
-        
-        if self.current_media_type == 'anime':
-            results = self.search_anime(search_term)
-            display_results = [f"{r.get('title', 'N/A')} ({r.get('type', 'N/A')}, {r.get('year', 'N/A')})" for r in results]
-        elif self.current_media_type == 'manga':
-            results = self.search_manga(search_term)
-            display_results = [f"{r.get('title', 'N/A')} ({r.get('type', 'N/A')}, {r.get('year', 'N/A')})" for r in results]
-        elif self.current_media_type == 'music':
-            results = self.search_music(search_term)
-            display_results = [f"{r.get('name', 'N/A')} by {r.get('artist', 'N/A')}" for r in results]
-        elif self.current_media_type == 'movie':
-            results = self.search_media(search_term, 'movie')
-            display_results = [
-                f"{r.get('title', 'N/A')} ({(r.get('release_date') or 'N/A')[:4]})"
-                for r in results
-            ]
-        elif self.current_media_type == 'tv':
-            results = self.search_media(search_term, 'tv')
-            display_results = [
-                f"{r.get('name', r.get('title', 'N/A'))} ({(r.get('first_air_date') or 'N/A')[:4]})"
-                for r in results
-            ]
-        
+        if self.current_media_type == 'all':
+            self.show_selection_screen([], [])
+            self.start_fanout_search(search_term)
+            return
+
+        media_type = self.current_media_type
+        cached = peek_search(media_type, search_term)
+        if cached:
+            self.show_selection_screen([(media_type, r) for r in cached],
+                                       [format_result(media_type, r) for r in cached])
+            return
+
+        # Searching may wait on the provider's rate limiter, so it never runs on the main thread
+        self.show_selection_screen([], [])
+        self.status_label.config(text="Searching...")
+        self.search_task = get_search_pool(self.root).submit(
+            search, media_type, search_term,
+            on_done=lambda results: self.on_search_results(media_type, search_term, results),
+            on_error=lambda error: self.on_search_results(media_type, search_term, [])
+        )
+
+    def on_search_results(self, media_type, search_term, results):
+        self.search_task = None
         if not results:
-            messagebox.showinfo("No Results", f"No results found for '{search_term}'")
+            self.status_label.config(text=f"No results found for '{search_term}'")
             return
-        
-        # Show selection screen
-        self.show_selection_screen(results, display_results)
+        self.status_label.config(text="")
+        for result in results:
+            self.results_listbox.insert(tk.END, format_result(media_type, result))
+            self.search_results.append((media_type, result))
+        self.prefetch_details(media_type, results)
+
+    def start_fanout_search(self, search_term):
+        # Every provider is queried at once, so the wait is the slowest provider rather than the sum
+        pool = get_search_pool(self.root)
+        self.fanout_tasks = {
+            media_type: pool.submit(
+                search, media_type, search_term,
+                on_done=lambda results, media_type=media_type: self.on_fanout_results(media_type, results),
+                on_error=lambda error, media_type=media_type: self.on_fanout_results(media_type, [])
+            )
+            for media_type in MEDIA_LABELS
+        }
+        self.update_fanout_status()
+
+    def on_fanout_results(self, media_type, results):
+        self.fanout_tasks.pop(media_type, None)
+        if results:
+            # Groups appear in the order providers answer
+            self.results_listbox.insert(tk.END, f"-- {MEDIA_LABELS[media_type]} --")
+            self.results_listbox.itemconfig(tk.END, foreground="gray", selectbackground="white",
+                                            selectforeground="gray")
+            self.search_results.append(None)
+            for result in results:
+                self.results_listbox.insert(tk.END, "    " + format_result(media_type, result))
+                self.search_results.append((media_type, result))
+            self.prefetch_details(media_type, results)
+        self.update_fanout_status()
+
+    def update_fanout_status(self):
+        answered = len(MEDIA_LABELS) - len(self.fanout_tasks)
+        if self.fanout_tasks:
+            self.status_label.config(text=f"Searching... ({answered}/{len(MEDIA_LABELS)} providers answered)")
+        elif self.search_results:
+            self.status_label.config(text="")
+        else:
+            self.status_label.config(text="No results found")
+
+    def prefetch_details(self, media_type, results):
+        # Warm the details cache for the likeliest picks so confirming one needs no round trip;
+        # results are discarded, get_details stores them in DETAILS_CACHE
+        if search_payload_complete(media_type):
+            return  # Added straight from the search payload, nothing to fetch
+        pool = get_pool(self.root, "prefetch", PREFETCH_WORKERS)
+        for result in results[:PREFETCH_COUNT]:
+            self.prefetch_tasks.append(pool.submit(get_details, media_type, result))
+
+    def cancel_prefetch(self, event=None):
+        for task in self.prefetch_tasks:
+            task.cancel()
+        self.prefetch_tasks = []
+
+    def cancel_search(self, event=None):
+        if self.search_task:
+            self.search_task.cancel()
+            self.search_task = None
+
+    def cancel_fanout_search(self, event=None):
+        for task in self.fanout_tasks.values():
+            task.cancel()
+        self.fanout_tasks = {}
 
     # UI screens
     def show_main_screen(self):
@@ -344,11 +304,13 @@ class EntryManager:
             ("Manga", "manga"),
             ("Music", "music"),
             ("Movie", "movie"),
-            ("TV Show", "tv")
+            ("TV Show", "tv"),
+            ("All", "all")
         ]
 
         for idx, (label, value) in enumerate(media_choices):
-            ttk.Radiobutton(frm, text=label, variable=self.selected_et, value=value).grid(
+            ttk.Radiobutton(frm, text=label, variable=self.selected_et, value=value,
+                            command=self.on_query_changed).grid(
                 column=0, row=idx, sticky=tk.W
             )
 
@@ -359,6 +321,15 @@ class EntryManager:
         namel.grid(column=0, row=next_row, sticky=tk.W)
         self.name_inp = tk.Entry(frm, font=(self.font, self.size), width=30, relief="solid", bd=2)
         self.name_inp.grid(column=0, row=next_row + 1, sticky=tk.W)
+        self.name_inp.bind("<KeyRelease>", self.on_query_changed)
+        # Leaving this screen by any route drops the pending timer and in-flight search
+        self.name_inp.bind("<Destroy>", self.cancel_suggestions)
+
+        # Live suggestions; double-click (or Enter) one to add it directly
+        self.suggest_listbox = tk.Listbox(frm, font=(self.font, self.size - 4), width=45, height=5)
+        self.suggest_listbox.grid(column=0, row=next_row + 2, sticky=tk.W, pady=(5, 0))
+        self.suggest_listbox.bind("<Double-Button-1>", self.on_suggestion_selected)
+        self.suggest_listbox.bind("<Return>", self.on_suggestion_selected)
 
         # Score input
         scorel = tk.Label(frm, text="Personal Score", font=(self.font, self.size))
@@ -394,6 +365,8 @@ class EntryManager:
         # Title
         title_label = tk.Label(main_frame, text="Select the correct item:", font=(self.font, self.size))
         title_label.pack(pady=10)
+        self.status_label = tk.Label(main_frame, text="", font=(self.font, self.size - 4))
+        self.status_label.pack()
         
         # Create listbox with scrollbar
         frame = tk.Frame(main_frame)
@@ -405,10 +378,16 @@ class EntryManager:
         self.results_listbox = tk.Listbox(frame, yscrollcommand=scrollbar.set, font=(self.font, self.size-2))
         self.results_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.config(command=self.results_listbox.yview)
+        # Results still streaming in are dropped once the user leaves this screen
+        self.results_listbox.bind("<Destroy>", self.cancel_search)
+        self.results_listbox.bind("<Destroy>", self.cancel_fanout_search, add="+")
+        self.results_listbox.bind("<Destroy>", self.cancel_prefetch, add="+")
         
         # Populate listbox
         for item in display_results:
             self.results_listbox.insert(tk.END, item)
+        if results:
+            self.prefetch_details(results[0][0], [result for _, result in results])
         
         # Button frame
         button_frame = tk.Frame(main_frame)
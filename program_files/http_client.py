@@ -0,0 +1,49 @@
+"""
+HTTP Client Module
+Shared keep-alive session used for all API and image traffic.
+"""
+
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_TIMEOUT = 10  # Seconds, applied to every request that does not pass its own timeout
+POOL_CONNECTIONS = 8  # Number of hosts whose connection pools are kept warm
+POOL_MAXSIZE = 10  # Keep-alive connections per host; at least the image worker count
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def configure(pool_connections=None, pool_maxsize=None, timeout=None):
+    """Adjust pool sizes or the default timeout; the session is rebuilt on next use."""
+    global POOL_CONNECTIONS, POOL_MAXSIZE, DEFAULT_TIMEOUT, _session
+    with _session_lock:
+        if pool_connections is not None:
+            POOL_CONNECTIONS = pool_connections
+        if pool_maxsize is not None:
+            POOL_MAXSIZE = pool_maxsize
+        if timeout is not None:
+            DEFAULT_TIMEOUT = timeout
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def get_session():
+    """Return the process-wide session; each host gets its own pool of reusable connections."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def get(url, **kwargs):
+    """requests.get replacement that reuses warm connections and always has a timeout."""
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    return get_session().get(url, **kwargs)
@@ -0,0 +1,58 @@
+"""
+ID Index Module
+Hash index over a media type's CONFIG id_fields for constant-time duplicate detection.
+"""
+
+
+def normalize_id_value(value):
+    """Compare ids case-insensitively and ignore stray whitespace ("Attack on titan" == "Attack On Titan ")."""
+    if value is None:
+        return ""
+    return " ".join(str(value).casefold().split())
+
+
+class IdIndex:
+    def __init__(self, id_fields):
+        self.id_fields = id_fields
+        self.rows = {}  # Normalized id tuple -> index of the first row with that id
+
+    def key(self, entry):
+        return tuple(normalize_id_value(entry.get(field)) for field in self.id_fields)
+
+    def build(self, data):
+        self.rows = {}
+        row_count = len(data[self.id_fields[0]]) if self.id_fields[0] in data else 0
+        for i in range(row_count):
+            key = tuple(normalize_id_value(data[field][i]) for field in self.id_fields)
+            self.rows.setdefault(key, i)
+        return self
+
+    def find(self, entry):
+        """Return the row index already holding entry's id, or None."""
+        return self.rows.get(self.key(entry))
+
+    def add(self, entry, row):
+        self.rows.setdefault(self.key(entry), row)
+
+
+def dedupe_data(data, id_fields):
+    """Collapse rows sharing an id: the first position is kept, holding the most recent values.
+
+    Returns the number of rows removed. data is modified in place.
+    """
+    index = IdIndex(id_fields)
+    row_count = len(data[id_fields[0]]) if id_fields[0] in data else 0
+    keep = []
+    for i in range(row_count):
+        entry = {field: data[field][i] for field in id_fields}
+        first = index.find(entry)
+        if first is None:
+            index.add(entry, i)
+            keep.append(i)
+        else:
+            for values in data.values():
+                values[first] = values[i]  # Later adds win, as they reflect the latest score
+
+    for column, values in data.items():
+        data[column] = [values[i] for i in keep]
+    return row_count - len(keep)
@@ -0,0 +1,127 @@
+"""
+Image Cache Module
+Keeps already-resized card thumbnails on disk so reopening a view needs no network access.
+"""
+
+import hashlib
+import io
+import os
+import threading
+import http_client
+from single_flight import SingleFlight
+from PIL import Image
+
+CACHE_DIR = "../cache/thumbnails"
+MAX_CACHE_BYTES = 200 * 1024 * 1024  # 200 MB cap before least recently used thumbnails are evicted
+THUMBNAIL_HEIGHT = 150
+
+
+class ThumbnailCache:
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes = None  # Computed on first write so startup never walks the cache
+
+    def _path(self, url, height):
+        # Content-addressed: the file name is a hash of the source URL and the target size
+        key = hashlib.sha256(f"{height}:{url}".encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, key[:2], f"{key}.png")
+
+    def get(self, url, height=THUMBNAIL_HEIGHT):
+        """Return the cached thumbnail for url, or None on a cache miss."""
+        path = self._path(url, height)
+        try:
+            with Image.open(path) as cached:
+                cached.load()
+                image = cached.copy()
+            os.utime(path)  # Bump mtime so eviction treats this entry as recently used
+            return image
+        except (FileNotFoundError, OSError):
+            return None
+
+    def put(self, url, image, height=THUMBNAIL_HEIGHT):
+        path = self._path(url, height)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if image.mode not in ("RGB", "RGBA", "L", "LA", "P"):
+            image = image.convert("RGB")  # PNG cannot hold CMYK or YCbCr JPEG data
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        image.save(tmp_path, format="PNG")
+
+        with self._lock:
+            try:
+                replaced = os.path.getsize(path)  # Overwriting a thumbnail frees the old file's bytes
+            except FileNotFoundError:
+                replaced = 0
+            os.replace(tmp_path, path)  # Readers never see a half-written thumbnail
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _, size, _ in self._scan())
+            else:
+                self._total_bytes += os.path.getsize(path) - replaced
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _scan(self):
+        for dirpath, _, filenames in os.walk(self.cache_dir):
+            for filename in filenames:
+                if not filename.endswith(".png"):
+                    continue
+                file_path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(file_path)
+                except FileNotFoundError:
+                    continue
+                yield file_path, stat.st_size, stat.st_mtime
+
+    def _evict(self):
+        # Drop least recently used thumbnails until we are comfortably below the cap
+        target = int(self.max_bytes * 0.9)
+        entries = sorted(self._scan(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        for file_path, size, _ in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(file_path)
+                total -= size
+            except FileNotFoundError:
+                pass
+        self._total_bytes = total
+
+
+def fetch_thumbnail(url, height=THUMBNAIL_HEIGHT):
+    """Download url and resize it to height, maintaining aspect ratio."""
+    response = http_client.get(url, stream=True)
+    response.raise_for_status()  # Raise an exception for HTTP errors
+
+    pil_image = Image.open(io.BytesIO(response.content))
+    aspect_ratio = pil_image.width / pil_image.height
+    target_width = int(height * aspect_ratio)
+    return pil_image.resize((target_width, height), Image.Resampling.LANCZOS)
+
+
+_default_cache = ThumbnailCache()
+
+
+_flights = SingleFlight()
+
+
+def get_thumbnail(url, height=THUMBNAIL_HEIGHT):
+    """Return a resized thumbnail for url, downloading it only on a cache miss.
+
+    Concurrent requests for the same url and height share one download and decode, and so receive the
+    same PIL image; draw from it, but never modify it in place.
+    """
+    return _flights.do((url, height), _load_thumbnail, url, height)
+
+
+def _load_thumbnail(url, height):
+    image = _default_cache.get(url, height)
+    if image is None:
+        image = fetch_thumbnail(url, height)
+        try:
+            _default_cache.put(url, image, height)
+        except OSError as e:
+            # A read-only or full disk should never stop the card from rendering
+            print(f"Could not cache thumbnail for {url}: {e}")
+    return image
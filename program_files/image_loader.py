@@ -0,0 +1,33 @@
+"""
+Image Loader Module
+Fetches and decodes card thumbnails on a bounded worker pool so views render immediately.
+"""
+
+import image_cache
+from tk_worker import TkWorkerPool
+
+MAX_IMAGE_WORKERS = 6
+
+
+class ImageLoader:
+    def __init__(self, root, max_workers=MAX_IMAGE_WORKERS):
+        self.pool = TkWorkerPool(root, max_workers=max_workers, name="image-loader")
+
+    def load(self, url, on_loaded, on_error, height=image_cache.THUMBNAIL_HEIGHT):
+        """Fetch url in the background; on_loaded receives a resized PIL image on the main thread."""
+        return self.pool.submit(image_cache.get_thumbnail, url, height, on_done=on_loaded, on_error=on_error)
+
+    def cancel_all(self):
+        self.pool.cancel_all()
+
+
+_loader = None
+
+
+def get_image_loader(widget):
+    """Return the process-wide loader bound to widget's root window."""
+    global _loader
+    root = widget.winfo_toplevel()
+    if _loader is None or _loader.pool.root is not root:
+        _loader = ImageLoader(root)
+    return _loader
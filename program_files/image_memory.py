@@ -0,0 +1,75 @@
+"""
+Image Memory Module
+Keeps decoded cover images (Tk PhotoImages) within a byte budget. Images shown by an on-screen card
+are pinned; images of cards that scrolled away stay cached until the budget needs their memory, oldest
+first, and are then decoded again from the on-disk thumbnail cache when their card comes back.
+
+Only used from the Tk main thread.
+"""
+
+from collections import OrderedDict
+from PIL import ImageTk
+
+IMAGE_MEMORY_BUDGET = 64 * 1024 * 1024  # Bytes of decoded pixels kept for off-screen cards
+BYTES_PER_PIXEL = 4  # Tk photo images hold 32-bit RGBA pixels
+
+
+class ImageMemory:
+    def __init__(self, budget_bytes=IMAGE_MEMORY_BUDGET):
+        self.budget_bytes = budget_bytes
+        self._images = OrderedDict()  # Key -> [PhotoImage, bytes, pin count], least recently used first
+        self.used_bytes = 0
+
+    def acquire(self, key):
+        """Return the resident PhotoImage for key, pinned for the caller, or None if it must be loaded."""
+        entry = self._images.get(key)
+        if entry is None:
+            return None
+        entry[2] += 1
+        self._images.move_to_end(key)
+        return entry[0]
+
+    def store(self, key, pil_image):
+        """Create (or reuse) the PhotoImage for key from a decoded image and pin it for the caller."""
+        photo = self.acquire(key)
+        if photo is not None:
+            return photo  # Another card with the same cover finished first
+        photo = ImageTk.PhotoImage(pil_image)
+        size = pil_image.width * pil_image.height * BYTES_PER_PIXEL
+        self._images[key] = [photo, size, 1]
+        self.used_bytes += size
+        self._evict()
+        return photo
+
+    def release(self, key):
+        """The caller no longer shows key's image; it may be evicted from now on."""
+        entry = self._images.get(key)
+        if entry is not None and entry[2] > 0:
+            entry[2] -= 1
+            self._evict()
+
+    def _evict(self):
+        if self.used_bytes <= self.budget_bytes:
+            return
+        for key in [key for key, entry in self._images.items() if entry[2] == 0]:
+            # Dropping the last reference deletes the Tk image and frees its pixels
+            self.used_bytes -= self._images.pop(key)[1]
+            if self.used_bytes <= self.budget_bytes:
+                break
+
+    def usage(self):
+        """Return (bytes in use, resident images, pinned images)."""
+        pinned = sum(1 for entry in self._images.values() if entry[2])
+        return self.used_bytes, len(self._images), pinned
+
+    def describe(self):
+        used, count, pinned = self.usage()
+        return (f"Cover images in memory: {used / 2**20:.1f} MB of {self.budget_bytes / 2**20:.0f} MB "
+                f"({count} images, {pinned} on screen)")
+
+
+_image_memory = ImageMemory()
+
+
+def get_image_memory():
+    return _image_memory
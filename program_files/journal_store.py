@@ -0,0 +1,286 @@
+"""
+Journal Store Module
+Append-only persistence for the stats files: each change is one JSONL record appended to a
+journal, loads replay the journal onto the JSON snapshot, and compaction folds it back in.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import threading
+from media_config import CONFIG
+from id_index import dedupe_data
+from binary_snapshot import read_binary, write_binary
+
+JOURNAL_SUFFIX = ".journal"
+STALE_SUFFIX = ".stale"  # A journal that no longer matches its snapshot is moved aside under this suffix
+COMPACT_THRESHOLD = 200  # Journal records before a background compaction is started
+
+
+def file_digest(file_path):
+    """SHA-256 hex digest of a snapshot file, or "" if there is none yet."""
+    try:
+        with open(file_path, 'rb') as file:
+            return hashlib.sha256(file.read()).hexdigest()
+    except FileNotFoundError:
+        return ""
+
+
+def read_snapshot_with_digest(file_path, default_structure):
+    """Return (persisted stats or a fresh copy of the configured structure, digest of the file read)."""
+    if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
+        return copy.deepcopy(default_structure), ""
+
+    try:
+        with open(file_path, 'rb') as file:
+            raw = file.read()
+        return json.loads(raw), hashlib.sha256(raw).hexdigest()
+    except (json.JSONDecodeError, UnicodeDecodeError, FileNotFoundError):
+        # Fall back to a clean template if the file is corrupt or missing mid-read.
+        return copy.deepcopy(default_structure), ""
+
+
+def read_snapshot(file_path, default_structure):
+    """Return persisted stats or a fresh copy of the configured structure."""
+    return read_snapshot_with_digest(file_path, default_structure)[0]
+
+
+def write_snapshot(data, file_path):
+    """Atomically write data in the columnar JSON format; returns the new file's digest."""
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    tmp_path = f"{file_path}.tmp"
+    raw = json.dumps({column: list(values) for column, values in data.items()}, indent=4).encode('utf-8')
+    with open(tmp_path, 'wb') as file:
+        file.write(raw)
+    os.replace(tmp_path, file_path)  # Atomic, so a crash never leaves a half-written snapshot
+    return hashlib.sha256(raw).hexdigest()
+
+
+def apply_record(data, record):
+    """Apply one journal record (add / update / delete) to columnar data in place."""
+    op = record.get("op")
+    if op == "add":
+        row_count = len(next(iter(data.values()), []))
+        for column, value in record["entry"].items():
+            # Columns introduced after the snapshot was written are back-filled so rows stay aligned
+            data.setdefault(column, [None] * row_count)
+        for column, values in data.items():
+            values.append(record["entry"].get(column))
+    elif op == "update":
+        for column, value in record["entry"].items():
+            data[column][record["index"]] = value
+    elif op == "delete":
+        for values in data.values():
+            del values[record["index"]]
+
+
+class JournalStore:
+    """Snapshot + journal persistence.
+
+    The journal's first line records the digest of the snapshot it applies to; the stats file itself
+    keeps its plain columnar format. Compaction writes the new snapshot and then atomically starts a
+    journal for it, so a crash between the two steps leaves a journal whose digest no longer matches,
+    which load() recognises as already folded in and moves aside instead of replaying.
+    """
+
+    def __init__(self, snapshot_path, default_structure, id_fields, compact_threshold=COMPACT_THRESHOLD,
+                 number_fields=()):
+        self.snapshot_path = snapshot_path
+        self.number_fields = number_fields  # Columns that also get a float64 array in the binary snapshot
+        self.journal_path = os.path.splitext(snapshot_path)[0] + JOURNAL_SUFFIX
+        self.default_structure = default_structure
+        self.id_fields = id_fields
+        self.compact_threshold = compact_threshold
+        self.journal_records = 0
+        self.snapshot_digest = None  # Digest of the snapshot, known after the first load or journal check
+        self._compacting = False
+        self._lock = threading.RLock()
+
+    def load(self):
+        """Replay the journal onto the snapshot; existing stats files load unchanged as snapshots."""
+        with self._lock:
+            data, self.snapshot_digest = self._read_base()
+            records = self._current_records()
+            for record in records:
+                apply_record(data, record)
+            self.journal_records = len(records)
+        self._maybe_compact()
+        return data
+
+    def files(self):
+        """Paths whose modification means the stored data changed."""
+        return [self.snapshot_path, self.journal_path]
+
+    def add(self, entry):
+        self._append([{"op": "add", "entry": entry}])
+        print(f"Data successfully stored in {self.journal_path}")
+
+    def update(self, index, entry):
+        """Overwrite the given fields of row index."""
+        self._append([{"op": "update", "index": index, "entry": entry}])
+        print(f"Data successfully stored in {self.journal_path}")
+
+    def delete(self, index):
+        self._append([{"op": "delete", "index": index}])
+        print(f"Data successfully stored in {self.journal_path}")
+
+    def write_batch(self, records):
+        """Append several add/update/delete records with a single write."""
+        self._append(records)
+        print(f"{len(records)} records stored in {self.journal_path}")
+
+    def dedupe(self):
+        """One-shot pass collapsing rows that share an id; returns the number of rows removed."""
+        with self._lock:
+            data = self._load_json()  # Plain lists straight from the JSON, never the mapped copy
+            removed = dedupe_data(data, self.id_fields)
+            if removed:
+                self.replace(data)
+            return removed
+
+    def replace(self, data):
+        """Make data the new snapshot and discard the journal, e.g. after an export from another backend."""
+        with self._lock:
+            self._write_base(data)
+
+    def compact(self):
+        """Fold the journal into a new snapshot and start an empty journal."""
+        with self._lock:
+            try:
+                self._write_base(self._load_json())
+                print(f"Compacted {self.journal_path} into {self.snapshot_path}")
+            finally:
+                self._compacting = False
+
+    def _write_base(self, data):
+        # Snapshot first, then the new journal: every crash point leaves a consistent pair
+        digest = write_snapshot(data, self.snapshot_path)
+        self._write_binary(data, digest)
+        self._start_journal(digest)
+        self.snapshot_digest = digest
+        self.journal_records = 0
+
+    def _load_json(self):
+        """Snapshot plus journal as plain lists parsed from the JSON; the only input to write_snapshot."""
+        data, self.snapshot_digest = read_snapshot_with_digest(self.snapshot_path, self.default_structure)
+        for record in self._current_records():
+            apply_record(data, record)
+        return data
+
+    def _read_base(self):
+        """The snapshot and its digest, memory-mapped from the binary copy when that is current."""
+        mapped = read_binary(self.snapshot_path)
+        if mapped is not None:
+            return mapped
+        data, digest = read_snapshot_with_digest(self.snapshot_path, self.default_structure)
+        self._write_binary(data, digest)  # Makes the next load a plain mmap
+        return data, digest
+
+    def _current_digest(self):
+        mapped = read_binary(self.snapshot_path)
+        return mapped[1] if mapped is not None else file_digest(self.snapshot_path)
+
+    def _write_binary(self, data, digest):
+        if not os.path.exists(self.snapshot_path):
+            return
+        try:
+            write_binary(data, self.snapshot_path, self.number_fields, digest)
+        except OSError as e:
+            print(f"Could not write binary snapshot for {self.snapshot_path}: {e}")
+
+    def _current_records(self):
+        """Journal records not yet in the snapshot. Needs self.snapshot_digest.
+
+        A journal started for a different snapshot was left behind by a crash between writing the snapshot
+        and starting the new journal, so its records are already folded in. It is kept under STALE_SUFFIX
+        rather than deleted, in case the snapshot was instead edited by hand.
+        """
+        digest, records = self._read_journal()
+        if digest is not None and digest != self.snapshot_digest:
+            stale_path = self.journal_path + STALE_SUFFIX
+            os.replace(self.journal_path, stale_path)
+            print(f"{self.journal_path} does not belong to the current {self.snapshot_path}; moved it to {stale_path}")
+            self._start_journal(self.snapshot_digest)
+            return []
+        return records
+
+    def _start_journal(self, digest):
+        os.makedirs(os.path.dirname(self.journal_path), exist_ok=True)
+        tmp_path = f"{self.journal_path}.tmp"
+        with open(tmp_path, 'w') as file:
+            file.write(json.dumps({"op": "snapshot", "digest": digest}) + "\n")
+        os.replace(tmp_path, self.journal_path)
+
+    def _read_journal(self):
+        """Return (digest of the snapshot the journal applies to, records); None for journals without one."""
+        digest, records = None, []
+        if not os.path.exists(self.journal_path):
+            return digest, records
+        with open(self.journal_path, 'r') as file:
+            for line in file:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from an interrupted write; _append cuts it off before writing again
+                    print(f"Skipping unreadable record in {self.journal_path}")
+                    continue
+                if record.get("op") == "snapshot":
+                    digest = record["digest"]
+                else:
+                    records.append(record)
+        return digest, records
+
+    def _append(self, records):
+        with self._lock:
+            if self.snapshot_digest is None:
+                # Nothing loaded yet in this process: set aside a stale journal before adding to it
+                self.snapshot_digest = self._current_digest()
+                self._current_records()
+            if os.path.exists(self.journal_path):
+                self._trim_torn_tail()
+            if not os.path.exists(self.journal_path) or os.path.getsize(self.journal_path) == 0:
+                self._start_journal(self.snapshot_digest)
+            with open(self.journal_path, 'a') as file:
+                file.write("".join(json.dumps(record) + "\n" for record in records))
+            self.journal_records += len(records)
+        self._maybe_compact()
+
+    def _trim_torn_tail(self):
+        """Cut a partial last line left by an interrupted write, so the next record starts on its own line."""
+        with open(self.journal_path, 'rb+') as file:
+            file.seek(0, os.SEEK_END)
+            size = file.tell()
+            if size == 0:
+                return
+            file.seek(size - 1)
+            if file.read(1) == b"\n":
+                return
+            file.seek(0)
+            keep = file.read().rfind(b"\n") + 1
+            file.truncate(keep)
+            print(f"Removed a partial record at the end of {self.journal_path}")
+
+    def _maybe_compact(self):
+        with self._lock:
+            if self._compacting or self.journal_records < self.compact_threshold:
+                return
+            self._compacting = True
+        threading.Thread(target=self.compact, name="journal-compaction", daemon=True).start()
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(media_type):
+    """Return the process-wide journal store for a media type."""
+    with _stores_lock:
+        if media_type not in _stores:
+            conf = CONFIG[media_type]
+            _stores[media_type] = JournalStore(conf['file_path'], conf['data_structure'], conf['id_fields'],
+                                               number_fields=conf['number_fields'])
+        return _stores[media_type]
@@ -0,0 +1,234 @@
+"""
+Library Index Module
+Sorted indexes and a genre -> rows inverted index over each media type's stats, so the card views can
+sort and filter without rescanning the column lists. Indexes are built on first use and kept up to
+date through the repository's write notifications. The trigram index behind text search is the slow one
+to build, so views start it on a worker thread as they open (prepare_text_search).
+"""
+
+import heapq
+from bisect import insort
+from media_config import CONFIG
+from media_repository import get_repository
+from media_values import parse_number, parse_genres
+from text_index import TrigramIndex
+
+
+def sort_key(value):
+    """Comparable key for a stored value, or None for blanks and placeholders (always listed last)."""
+    number = parse_number(value)
+    if number is not None:
+        return (0, number)
+    if isinstance(value, str) and value.strip() and value != "N/A":
+        return (1, value)  # Dates such as "2019-04-26" sort correctly as text
+    return None
+
+
+class LibraryIndex:
+    def __init__(self, media_type, data):
+        self.media_type = media_type
+        self.data = data
+        # Shares the repository's lock, so a write and its index update are seen together
+        self._lock = get_repository().lock(media_type)
+        self._sorted = {}  # Column -> sorted [(key, row)] for rows with a usable value, built lazily
+        self._unsorted = {}  # Column -> rows without a usable value, in insertion order
+        self._genres = {}  # Genre -> set of rows
+        self._row_genres = []  # Row -> genres it was indexed under
+        self._text = None  # TrigramIndex, built by build_text_index or on the first text search
+        self._version = object()  # Replaced on every write, so a background build can tell it went stale
+        for row, genres in enumerate(data.get('genres', [])):
+            self._index_genres(row, genres)
+
+    def _index_genres(self, row, genres):
+        names = parse_genres(genres)
+        self._row_genres.append(names)
+        for genre in names:
+            self._genres.setdefault(genre, set()).add(row)
+
+    def _build_column(self, column):
+        keyed, missing = [], []
+        for row, value in enumerate(self.data.get(column, [])):
+            key = sort_key(value)
+            if key is None:
+                missing.append(row)
+            else:
+                keyed.append((key, row))
+        keyed.sort()
+        self._sorted[column], self._unsorted[column] = keyed, missing
+
+    def _text_fields(self):
+        conf = CONFIG[self.media_type]
+        return [conf['title_field']] + (['artist'] if 'artist' in self.data else []) + ['genres']
+
+    def text_ready(self):
+        return self._text is not None
+
+    def build_text_index(self):
+        """Build the trigram index if it is missing. Safe on a worker thread: the lock is only held to copy
+        the text columns and to install the result, which is redone if a write landed in between."""
+        while True:
+            with self._lock:
+                if self._text is not None:
+                    return
+                version = self._version
+                fields = self._text_fields()
+                columns = {field: list(self.data.get(field, [])) for field in fields}
+            text = TrigramIndex(fields).build(columns)
+            with self._lock:
+                if self._version is version:
+                    self._text = text
+                    return
+
+    def search(self, text, limit=None, genres=()):
+        """Return {row: relevance} for the best limit rows fuzzily matching text and tagged with every
+        genre in genres."""
+        with self._lock:
+            self.build_text_index()  # A no-op once built; views build it in the background beforehand
+            return {row: score for score, row in self._text.search(text, limit, self._rows_with_genres(genres))}
+
+    def _rows_with_genres(self, genres):
+        """Set of rows tagged with every genre in genres, or None when genres is empty."""
+        allowed = None
+        for genre in genres:
+            rows = self._genres.get(genre, set())
+            allowed = rows if allowed is None else allowed & rows
+        return allowed
+
+    def genre_counts(self):
+        """Return [(genre, entry count)], most common first."""
+        with self._lock:
+            return sorted(((genre, len(rows)) for genre, rows in self._genres.items()),
+                          key=lambda item: (-item[1], item[0]))
+
+    def keyed_rows(self, column=None, descending=False, genres=()):
+        """Return [(key, row)] for rows tagged with every genre in genres, sorted by column.
+
+        Without a column rows keep insertion order; rows lacking a value for the column come last.
+        """
+        with self._lock:
+            allowed = self._rows_with_genres(genres)
+            if column is None:
+                rows = sorted(allowed) if allowed is not None else range(len(self._row_genres))
+                return [(None, row) for row in rows]
+            if column not in self._sorted:
+                self._build_column(column)
+            keyed = reversed(self._sorted[column]) if descending else self._sorted[column]
+            missing = [(None, row) for row in self._unsorted[column]]
+            if allowed is None:
+                return list(keyed) + missing
+            return [item for item in keyed if item[1] in allowed] + [item for item in missing if item[1] in allowed]
+
+    def keyed_subset(self, column, descending, rows):
+        """Like keyed_rows, for just the given rows (e.g. text matches), without touching the rest."""
+        with self._lock:
+            values = self.data[column]
+            keyed = [(sort_key(values[row]), row) for row in rows]
+        present = sorted((item for item in keyed if item[0] is not None), reverse=descending)
+        return present + sorted(item for item in keyed if item[0] is None)
+
+    def apply(self, record):
+        """Update the indexes for one write already applied to self.data."""
+        with self._lock:
+            self._version = object()
+            op = record.get("op")
+            if op == "add":
+                row = len(self._row_genres)
+                self._index_genres(row, record["entry"].get('genres'))
+                for column in self._sorted:
+                    self._insert(column, row)
+                if self._text is not None:
+                    self._text.add(record["entry"])
+            elif op == "update":
+                row = record["index"]
+                if 'genres' in record["entry"]:
+                    for genre in self._row_genres[row]:
+                        self._genres[genre].discard(row)
+                    self._row_genres[row] = parse_genres(record["entry"]['genres'])
+                    for genre in self._row_genres[row]:
+                        self._genres.setdefault(genre, set()).add(row)
+                if self._text is not None and any(field in record["entry"] for field in self._text.text_fields):
+                    self._text.update(row, {field: self.data[field][row] for field in self._text.text_fields})
+                for column in self._sorted:
+                    if column in record["entry"]:
+                        self._sorted[column] = [item for item in self._sorted[column] if item[1] != row]
+                        if row in self._unsorted[column]:
+                            self._unsorted[column].remove(row)
+                        self._insert(column, row)
+            elif op == "delete":
+                # Every later row shifts down by one, so start over (deletes are rare)
+                self.__init__(self.media_type, self.data)
+
+    def _insert(self, column, row):
+        key = sort_key(self.data[column][row])
+        if key is None:
+            self._unsorted[column].append(row)
+            self._unsorted[column].sort()
+        else:
+            insort(self._sorted[column], (key, row))
+
+
+_indexes = {}
+_subscribed = False
+
+
+def _on_write(media_type, record, data):
+    index = _indexes.get(media_type)
+    if index is not None and index.data is data:
+        index.apply(record)
+
+
+def get_library_index(media_type):
+    """Return the index for a media type, rebuilding it if the repository reloaded the data."""
+    global _subscribed
+    repository = get_repository()
+    with repository.lock(media_type):
+        if not _subscribed:
+            repository.subscribe(_on_write)
+            _subscribed = True
+        data = repository.get(media_type)
+        index = _indexes.get(media_type)
+        if index is None or index.data is not data:
+            index = _indexes[media_type] = LibraryIndex(media_type, data)
+        return index
+
+
+def prepare_text_search(media_types):
+    """Build the text indexes for media_types; meant for a worker thread as a view opens."""
+    for media_type in media_types:
+        get_library_index(media_type).build_text_index()
+
+
+def text_search_ready(media_types):
+    return all(get_library_index(media_type).text_ready() for media_type in media_types)
+
+
+def query_rows(media_types, sort_label=None, descending=False, genres=(), text=None, limit=None):
+    """Return [(media_type, row)] across media_types, filtered by genres and sorted by sort_label.
+
+    Several media types are merged in key order, so movies and TV shows interleave correctly.
+    With text, only fuzzy matches are kept, ranked by relevance unless a sort_label is given; limit caps them
+    at the best limit overall, or with a sort_label at the best limit per media type before sorting.
+    """
+    streams = []
+    for media_type in media_types:
+        index = get_library_index(media_type)
+        column = CONFIG[media_type]['sort_fields'].get(sort_label) if sort_label else None
+        if text:
+            relevance = index.search(text, limit, genres)
+            if column:
+                keyed = index.keyed_subset(column, descending, relevance)
+            else:
+                keyed = [(score, row) for row, score in relevance.items()]
+        else:
+            keyed = index.keyed_rows(column, descending, genres)
+        streams.append([(key, media_type, row) for key, row in keyed])
+    if text and not sort_label:
+        ranked = heapq.nlargest(limit, (item for stream in streams for item in stream), key=lambda item: item[0]) \
+            if limit else sorted((item for stream in streams for item in stream), key=lambda item: -item[0])
+        return [(media_type, row) for _, media_type, row in ranked]
+    if not sort_label or len(streams) == 1:
+        return [(media_type, row) for stream in streams for _, media_type, row in stream]
+    present = [[item for item in stream if item[0] is not None] for stream in streams]
+    missing = [item for stream in streams for item in stream if item[0] is None]
+    merged = heapq.merge(*present, key=lambda item: item[0], reverse=descending)
+    return [(media_type, row) for _, media_type, row in list(merged) + missing]
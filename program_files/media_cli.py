@@ -0,0 +1,188 @@
+"""
+Media CLI
+Headless command line interface over the GUI-free core; never imports tkinter or Pillow.
+
+Usage:
+    python media_cli.py add MEDIA_TYPE QUERY --score S [--pick N | --id ID]
+    python media_cli.py list MEDIA_TYPE [--limit N]
+    python media_cli.py stats [MEDIA_TYPE ...]
+    python media_cli.py export MEDIA_TYPE [--format json|csv] [--output FILE]
+    python media_cli.py import FILE [--fresh]
+"""
+
+import argparse
+import csv
+import json
+import sys
+from media_config import CONFIG
+from media_repository import get_repository
+from media_values import parse_number, parse_genres
+
+
+def _row(data, index):
+    return {column: values[index] for column, values in data.items()}
+
+
+def _row_count(data, media_type):
+    return len(data.get(CONFIG[media_type]['title_field'], []))
+
+
+def cmd_add(args):
+    import media_core  # Deferred: requests is only needed when talking to the APIs
+
+    if args.id:
+        details = media_core.get_details_by_id(args.media_type, args.id)
+    else:
+        results = media_core.search(args.media_type, args.query)
+        if not results:
+            print(f"No results found for '{args.query}'")
+            return 1
+        if args.pick is None and len(results) > 1:
+            for number, result in enumerate(results, start=1):
+                print(f"{number}. {media_core.format_result(args.media_type, result)}")
+            if not sys.stdin.isatty():
+                print("Several matches; rerun with --pick N")
+                return 1
+            try:
+                args.pick = int(input("Pick a number: "))
+            except (ValueError, EOFError):
+                print("Please enter a number")
+                return 1
+        pick = 1 if args.pick is None else args.pick
+        if not 1 <= pick <= len(results):
+            print(f"Pick must be between 1 and {len(results)}")
+            return 1
+        chosen = results[pick - 1]
+        details = media_core.get_details(args.media_type, chosen)
+
+    if not details:
+        print("Could not retrieve details for the selected item")
+        return 1
+
+    entry = media_core.build_entry(args.media_type, details, args.score)
+    added, updated = get_repository().add_many(args.media_type, [entry])
+    title = entry[CONFIG[args.media_type]['title_field']]
+    print(f"{'Added' if added else 'Updated'} {title}")
+    return 0
+
+
+def cmd_list(args):
+    conf = CONFIG[args.media_type]
+    data = get_repository().get(args.media_type)
+    count = _row_count(data, args.media_type)
+    for index in range(min(count, args.limit) if args.limit else count):
+        row = _row(data, index)
+        title = row[conf['title_field']]
+        if args.media_type == 'music':
+            title = f"{title} by {row['artist']}"
+        score = f"  score {row[conf['score_field']]}" if conf['score_field'] else ""
+        print(f"{index + 1:>4}. {title}{score}  yours {row[conf['personal_score_field']]}")
+    return 0
+
+
+def cmd_stats(args):
+    repository = get_repository()
+    for media_type in args.media_types or list(CONFIG):
+        conf = CONFIG[media_type]
+        data = repository.get(media_type)
+        count = _row_count(data, media_type)
+        personal = [n for n in map(parse_number, data.get(conf['personal_score_field'], [])) if n is not None]
+        genre_counts = {}
+        for genres in data.get('genres', []):
+            for genre in parse_genres(genres):
+                genre_counts[genre] = genre_counts.get(genre, 0) + 1
+        top_genres = sorted(genre_counts.items(), key=lambda item: -item[1])[:5]
+
+        print(f"{media_type}: {count} entries")
+        if personal:
+            print(f"  mean personal score: {sum(personal) / len(personal):.2f}")
+        if conf['score_field']:
+            public = [n for n in map(parse_number, data.get(conf['score_field'], [])) if n is not None]
+            if public:
+                print(f"  mean public score:   {sum(public) / len(public):.2f}")
+        if top_genres:
+            print("  top genres: " + ", ".join(f"{genre} ({n})" for genre, n in top_genres))
+    return 0
+
+
+def cmd_export(args):
+    data = get_repository().get(args.media_type)
+    output = open(args.output, 'w', newline='', encoding='utf-8') if args.output else sys.stdout
+    try:
+        if args.format == 'json':
+            # Same columnar layout as the stats files
+            json.dump({column: list(values) for column, values in data.items()}, output, indent=4)
+            output.write("\n")
+        else:
+            writer = csv.writer(output)
+            columns = list(data)
+            writer.writerow(columns)
+            for index in range(_row_count(data, args.media_type)):
+                writer.writerow([
+                    "; ".join(parse_genres(value)) if column == 'genres' else value
+                    for column, value in _row(data, index).items()
+                ])
+    finally:
+        if args.output:
+            output.close()
+    return 0
+
+
+def cmd_import(args):
+    from bulk_import import bulk_import
+
+    bulk_import(args.file, fresh=args.fresh)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="MediaDiary command line interface")
+    commands = parser.add_subparsers(dest="command", required=True)
+    media_types = list(CONFIG)
+
+    add = commands.add_parser("add", help="search a provider and add an entry")
+    add.add_argument("media_type", choices=media_types)
+    add.add_argument("query", nargs="?", default="")
+    add.add_argument("--score", required=True, help="your personal score")
+    add.add_argument("--pick", type=int, help="which search result to add (1-based)")
+    add.add_argument("--id", help="provider id instead of a query (not for music)")
+    add.set_defaults(handler=cmd_add)
+
+    list_cmd = commands.add_parser("list", help="list stored entries")
+    list_cmd.add_argument("media_type", choices=media_types)
+    list_cmd.add_argument("--limit", type=int, default=0)
+    list_cmd.set_defaults(handler=cmd_list)
+
+    stats = commands.add_parser("stats", help="summary statistics")
+    stats.add_argument("media_types", nargs="*", metavar="media_type", help=f"any of {', '.join(media_types)}")
+    stats.set_defaults(handler=cmd_stats)
+
+    export = commands.add_parser("export", help="export a media type as JSON or CSV")
+    export.add_argument("media_type", choices=media_types)
+    export.add_argument("--format", choices=["json", "csv"], default="json")
+    export.add_argument("--output", "-o", help="file to write (default: stdout)")
+    export.set_defaults(handler=cmd_export)
+
+    import_cmd = commands.add_parser("import", help="bulk import a CSV or JSONL file")
+    import_cmd.add_argument("file")
+    import_cmd.add_argument("--fresh", action="store_true", help="ignore progress from an interrupted run")
+    import_cmd.set_defaults(handler=cmd_import)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == "add" and not (args.query or args.id):
+        print("add needs a query or --id")
+        return 1
+    if args.command == "add" and args.id and args.media_type == "music":
+        print("--id is not supported for music; search by album name instead")
+        return 1
+    if args.command == "stats" and set(args.media_types) - set(CONFIG):
+        print(f"Unknown media type; choose from {', '.join(CONFIG)}")
+        return 1
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
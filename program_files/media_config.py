@@ -0,0 +1,79 @@
+"""
+Media Config Module
+Per-media-type storage layout shared by the GUI, the entry manager and the storage backends.
+"""
+
+# Configuration for different media types
+# title/score/personal_score fields name the columns used for display, sorting and statistics;
+# sort_fields maps the labels offered in the card views' sort menu to columns;
+# number_fields are stored as fixed-width floats in the binary snapshot
+CONFIG = {
+    "music": {
+        "file_path": "../statistics/music_stats.txt",
+        "data_structure": {
+            "name": [], "artist": [], "genres": [], "image_url": [],
+            "personal_score": [], "playcount": []
+        },
+        "id_fields": ["artist", "name"],
+        "title_field": "name",
+        "score_field": None,
+        "personal_score_field": "personal_score",
+        "sort_fields": {"Personal score": "personal_score", "Playcount": "playcount"},
+        "number_fields": ["personal_score", "playcount"]
+    },
+    "anime": {
+        "file_path": "../statistics/anime_stats.txt",
+        "data_structure": {
+            "names": [], "scores": [], "genres": [], "personal_scores": [],
+            "personal_comments": [], "image_url": []
+        },
+        "id_fields": ["names"],
+        "title_field": "names",
+        "score_field": "scores",
+        "personal_score_field": "personal_scores",
+        "sort_fields": {"Score": "scores", "Personal score": "personal_scores", "Year": "personal_comments"},
+        "number_fields": ["scores", "personal_scores"]
+    },
+    "manga": {
+        "file_path": "../statistics/manga_stats.txt",
+        "data_structure": {
+            "names": [], "scores": [], "genres": [], "personal_scores": [],
+            "personal_comments": [], "image_url": []
+        },
+        "id_fields": ["names"],
+        "title_field": "names",
+        "score_field": "scores",
+        "personal_score_field": "personal_scores",
+        "sort_fields": {"Score": "scores", "Personal score": "personal_scores", "Year": "personal_comments"},
+        "number_fields": ["scores", "personal_scores"]
+    },
+    "movie": {
+        "file_path": "../statistics/movie_stats.txt",
+        "data_structure": {
+            "title": [], "personal_score": [], "score": [], "genres": [],
+            "release_date": [], "image_url": []
+        },
+        "id_fields": ["title", "release_date"],
+        "title_field": "title",
+        "score_field": "score",
+        "personal_score_field": "personal_score",
+        "sort_fields": {"Score": "score", "Personal score": "personal_score", "Release date": "release_date"},
+        "number_fields": ["personal_score", "score"]
+    },
+    "tv": {
+        "file_path": "../statistics/tv_stats.txt",
+        "data_structure": {
+            "title": [], "personal_score": [], "score": [], "genres": [],
+            "release_date": [], "image_url": []
+        },
+        "id_fields": ["title", "release_date"],
+        "title_field": "title",
+        "score_field": "score",
+        "personal_score_field": "personal_score",
+        "sort_fields": {"Score": "score", "Personal score": "personal_score", "Release date": "release_date"},
+        "number_fields": ["personal_score", "score"]
+    }
+}
+
+# Where entries are persisted: "journal" (JSON snapshot + append-only journal) or "sqlite"
+STORAGE_BACKEND = "journal"
@@ -0,0 +1,247 @@
+"""
+Media Core Module
+GUI-free search, detail and entry-building logic shared by the Tk entry manager, the CLI and
+bulk import. Importing this module never loads tkinter or Pillow.
+"""
+
+import requests
+import api_keys
+import rate_limiter
+from response_cache import cached, SEARCH_CACHE, DETAILS_CACHE
+
+
+def format_result(media_type, r):
+    """One-line description of a search result for the selection list."""
+    if media_type in ('anime', 'manga'):
+        return f"{r.get('title', 'N/A')} ({r.get('type', 'N/A')}, {r.get('year', 'N/A')})"
+    elif media_type == 'music':
+        return f"{r.get('name', 'N/A')} by {r.get('artist', 'N/A')}"
+    elif media_type == 'movie':
+        return f"{r.get('title', 'N/A')} ({(r.get('release_date') or 'N/A')[:4]})"
+    return f"{r.get('name', r.get('title', 'N/A'))} ({(r.get('first_air_date') or 'N/A')[:4]})"
+
+
+def build_entry(media_type, details, personal_score):
+    """Turn a provider details payload into one row of the media type's stats columns."""
+    if media_type == 'anime':
+        entry = {
+            'names': details.get('title', 'N/A'),
+            'scores': details.get('score', 'N/A'),
+            'genres': [g['name'] for g in details.get('genres', [])],
+            'personal_scores': personal_score,
+            'personal_comments': details.get('year' , 'N/A'),
+            'image_url': details.get('images', {}).get('jpg', {}).get('image_url', ''),
+        }
+
+    elif media_type == 'manga':
+        entry = {
+            'names': details.get('title', 'N/A'),
+            'scores': details.get('score', 'N/A'),
+            'genres': [g['name'] for g in details.get('genres', [])],
+            'personal_scores': personal_score,
+            'personal_comments': (details.get('published', {}).get('from') or 'N/A')[:4],
+            'image_url': details.get('images', {}).get('jpg', {}).get('image_url', ''),
+        }
+
+    elif media_type == 'music':
+        image = next((img['#text'] for img in reversed(details.get('image', [])) if img.get('#text')), '')
+        entry = {
+            'name': details.get('name', 'N/A'),
+            'artist': details.get('artist', 'N/A'),
+            'genres': [t['name'] for t in details.get('tags', {}).get('tag', [])],
+            'image_url': image,
+            'personal_score': personal_score,
+            'playcount': details.get('playcount'),  # None, not '0', when missing: known_values must drop it
+        }
+
+    elif media_type == 'movie':
+        poster_path = details.get('poster_path', '')
+        entry = {
+            'title': details.get('title', 'N/A'),
+            'personal_score': personal_score,
+            'score': details.get('vote_average', 'N/A'),
+            'genres': [g['name'] for g in details.get('genres', [])],
+            'release_date': details.get('release_date', 'N/A'),
+            'image_url': f"https://image.tmdb.org/t/p/w500{poster_path}" if poster_path else '',
+        }
+
+    elif media_type == 'tv':
+        poster_path = details.get('poster_path', '')
+        entry = {
+            'title': details.get('name') or details.get('title', 'N/A'),
+            'personal_score': personal_score,
+            'score': details.get('vote_average', 'N/A'),
+            'genres': [g['name'] for g in details.get('genres', [])],
+            'release_date': details.get('first_air_date', 'N/A'),
+            'image_url': f"https://image.tmdb.org/t/p/w500{poster_path}" if poster_path else '',
+        }
+
+    return entry
+
+
+# API search functions (responses are cached by media type and normalized query)
+@cached(SEARCH_CACHE, lambda query: ("anime", query))
+def search_anime(query):
+    url = "https://api.jikan.moe/v4/anime"
+    params = {'q': query, 'limit': 10}
+    try:
+        response = rate_limiter.get(url, params=params)
+        response.raise_for_status()
+        data = response.json()
+        return data.get('data', [])
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching anime data: {e}")
+        return []
+
+
+@cached(SEARCH_CACHE, lambda query: ("manga", query))
+def search_manga(query):
+    url = "https://api.jikan.moe/v4/manga"
+    params = {'q': query, 'limit': 10}
+    try:
+        response = rate_limiter.get(url, params=params)
+        response.raise_for_status()
+        data = response.json()
+        return data.get('data', [])
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching manga data: {e}")
+        return []
+
+
+@cached(SEARCH_CACHE, lambda query: ("music", query))
+def search_music(query):
+    params = {
+        'method': 'album.search', 'album': query, 'api_key': api_keys.MUSIC_API,
+        'format': 'json', 'limit': 10
+    }
+    try:
+        response = rate_limiter.get('http://ws.audioscrobbler.com/2.0/', params=params)
+        response.raise_for_status()
+        data = response.json()
+        return data.get('results', {}).get('albummatches', {}).get('album', [])
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching music data: {e}")
+        return []
+
+
+@cached(SEARCH_CACHE, lambda query, media_type: (media_type, query))
+def search_media(query, media_type):
+    headers = {"Authorization": api_keys.MOVIE_API}
+    url = f"https://api.themoviedb.org/3/search/{media_type}"
+    params = {'query': query, 'language': 'en-US', 'page': 1}
+    try:
+        response = rate_limiter.get(url, params=params, headers=headers)
+        response.raise_for_status()
+        data = response.json()
+        return data.get('results', [])
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching {media_type} data: {e}")
+        return []
+
+
+# API detail functions (responses are cached by media type and id)
+@cached(DETAILS_CACHE, lambda anime_id: ("anime", anime_id))
+def get_anime_details(anime_id):
+    url = f"https://api.jikan.moe/v4/anime/{anime_id}"
+    try:
+        response = rate_limiter.get(url)
+        response.raise_for_status()
+        data = response.json()
+        return data.get('data')
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching anime details: {e}")
+        return None
+
+
+@cached(DETAILS_CACHE, lambda manga_id: ("manga", manga_id))
+def get_manga_details(manga_id):
+    url = f"https://api.jikan.moe/v4/manga/{manga_id}"
+    try:
+        response = rate_limiter.get(url)
+        response.raise_for_status()
+        data = response.json()
+        return data.get('data')
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching manga details: {e}")
+        return None
+
+
+@cached(DETAILS_CACHE, lambda artist, album: ("music", artist, album))
+def get_music_details(artist, album):
+    params = {
+        'method': 'album.getinfo', 'artist': artist, 'album': album,
+        'api_key': api_keys.MUSIC_API, 'format': 'json'
+    }
+    try:
+        response = rate_limiter.get('http://ws.audioscrobbler.com/2.0/', params=params)
+        response.raise_for_status()
+        data = response.json()
+        return data.get('album')
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching music details: {e}")
+        return None
+
+
+@cached(DETAILS_CACHE, lambda media_id, media_type: (media_type, media_id))
+def get_media_details(media_id, media_type):
+    headers = {"Authorization": api_keys.MOVIE_API}
+    url = f"https://api.themoviedb.org/3/{media_type}/{media_id}"
+    try:
+        response = rate_limiter.get(url, headers=headers)
+        response.raise_for_status()
+        return response.json()
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching {media_type} details: {e}")
+        return None
+
+
+# Dispatch helpers shared by the GUI, the CLI and bulk import
+def peek_search(media_type, query):
+    """Return cached search results without touching the network, or None."""
+    return SEARCH_CACHE.get((media_type, query))
+
+
+def peek_details(media_type, item):
+    """Return cached details for a search result without touching the network, or None."""
+    return DETAILS_CACHE.get(_details_key(media_type, item))
+
+
+def search_payload_complete(media_type):
+    """True when a search result already carries every field build_entry reads."""
+    # Jikan search results are full anime/manga objects; Last.fm lacks tags and playcount, TMDB genre names
+    return media_type in ('anime', 'manga')
+
+
+def _details_key(media_type, item):
+    # Must match the keys used by the @cached detail functions above
+    if media_type == 'music':
+        return ("music", item['artist'], item['name'])
+    return (media_type, item['mal_id'] if media_type in ('anime', 'manga') else item['id'])
+
+
+def search(media_type, query):
+    if media_type == 'anime':
+        return search_anime(query)
+    elif media_type == 'manga':
+        return search_manga(query)
+    elif media_type == 'music':
+        return search_music(query)
+    return search_media(query, media_type)
+
+
+def get_details(media_type, item):
+    """Fetch details for a search result of the given media type."""
+    if media_type == 'music':
+        return get_music_details(item['artist'], item['name'])
+    return get_details_by_id(media_type, item['mal_id'] if media_type in ('anime', 'manga') else item['id'])
+
+
+def get_details_by_id(media_type, item_id):
+    """Fetch details by provider id (MyAnimeList id for anime/manga, TMDB id for movie/tv)."""
+    if media_type == 'anime':
+        return get_anime_details(item_id)
+    elif media_type == 'manga':
+        return get_manga_details(item_id)
+    elif media_type in ('movie', 'tv'):
+        return get_media_details(item_id, media_type)
+    raise ValueError(f"{media_type} entries cannot be looked up by id")
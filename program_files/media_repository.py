@@ -0,0 +1,160 @@
+"""
+Media Repository Module
+Process-wide owner of the parsed stats for each media type. The GUI reads from it and the entry
+manager writes through it, so data is only parsed again when its files change outside this process.
+"""
+
+import os
+import threading
+from collections.abc import Mapping
+from media_config import CONFIG
+from id_index import IdIndex
+from journal_store import apply_record
+from storage import get_store
+
+
+def _file_signature(paths):
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            signature.append((stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            signature.append(None)
+    return tuple(signature)
+
+
+class MediaRepository:
+    def __init__(self):
+        self._data = {}  # Media type -> columnar data shared with every reader
+        self._indexes = {}  # Media type -> IdIndex over CONFIG id_fields
+        self._signatures = {}  # Media type -> file (mtime, size) tuples as of the last load or write
+        self._listeners = []  # Called as listener(media_type, record, data) after each applied write
+        # One lock per media type, so opening Music never waits on a background load of Anime
+        self._locks = {media_type: threading.RLock() for media_type in CONFIG}
+
+    def get(self, media_type):
+        """Return the data for a media type, parsing it on first access or if its files changed on disk."""
+        with self._locks[media_type]:
+            store = get_store(media_type)
+            signature = _file_signature(store.files())
+            if media_type not in self._data or self._signatures[media_type] != signature:
+                data = store.load()
+                self._data[media_type] = data
+                self._indexes[media_type] = IdIndex(CONFIG[media_type]['id_fields']).build(data)
+                self._signatures[media_type] = signature
+            return self._data[media_type]
+
+    def find(self, media_type, entry):
+        """Return the index of the row with the same id fields as entry, or None."""
+        with self._locks[media_type]:
+            self.get(media_type)
+            return self._indexes[media_type].find(entry)
+
+    def add(self, media_type, entry):
+        """Append entry, or update the stored row with the same id fields if there is one."""
+        self._write(media_type, [{"op": "add", "entry": entry}])
+
+    def update(self, media_type, index, entry):
+        """Overwrite the given fields of row index."""
+        self._write(media_type, [{"op": "update", "index": index, "entry": entry}])
+
+    def add_many(self, media_type, entries):
+        """Persist many entries with one store write; entries already present are updated in place.
+
+        Returns (added, updated) counts.
+        """
+        return self._write(media_type, [{"op": "add", "entry": entry} for entry in entries])
+
+    def _resolve_adds(self, media_type, data, records):
+        """Turn "add" records for ids that already exist (stored, or added earlier in the same batch)
+        into "update" records, so every backend receives the same operations and the in-memory rows
+        stay aligned with the stored ones."""
+        index = self._indexes[media_type]
+        pending = {}  # Ids added earlier in this same batch -> their future row
+        row_count = len(data[CONFIG[media_type]['id_fields'][0]])
+        resolved = []
+        for record in records:
+            if record["op"] == "add":
+                key = index.key(record["entry"])
+                existing = index.find(record["entry"])
+                if existing is None:
+                    existing = pending.get(key)
+                if existing is None:
+                    pending[key] = row_count + len(pending)
+                else:
+                    record = {"op": "update", "index": existing, "entry": record["entry"]}
+            resolved.append(record)
+        return resolved, len(pending)
+
+    def _write(self, media_type, records):
+        with self._locks[media_type]:
+            data = self.get(media_type)
+            records, added = self._resolve_adds(media_type, data, records)
+            merged = get_store(media_type).write_batch(records)
+            id_fields = CONFIG[media_type]['id_fields']
+            rebuild = False
+            for record in records:
+                if record["op"] == "add":
+                    self._indexes[media_type].add(record["entry"], len(data[id_fields[0]]))
+                elif any(field in record.get("entry", {}) for field in id_fields):
+                    rebuild = True
+                apply_record(data, record)
+                for listener in self._listeners:
+                    listener(media_type, record, data)
+            if rebuild:
+                self._indexes[media_type].build(data)
+            if merged:
+                # The store folded an add into an existing row after all; reload rather than drift
+                self._data.pop(media_type, None)
+            else:
+                self._remember_write(media_type)
+            return added, len(records) - added
+
+    def lock(self, media_type):
+        """The re-entrant lock guarding a media type's data; hold it to read rows consistently."""
+        return self._locks[media_type]
+
+    def subscribe(self, listener):
+        """Register listener(media_type, record, data), called under the media type's lock after every
+        add / update / delete this process applies. A reload from disk replaces data instead, so
+        listeners holding derived state should compare against the object get() returns."""
+        self._listeners.append(listener)
+
+    def preload_in_background(self, media_types=None):
+        """Warm the cache off the main thread so the first view opens without a parse."""
+        def preload():
+            for media_type in media_types or CONFIG:
+                self.get(media_type)
+        threading.Thread(target=preload, name="repository-preload", daemon=True).start()
+
+    def data_sources(self):
+        """Mapping of media type -> data that loads each type on first access."""
+        return LazyDataSources(self)
+
+    def _remember_write(self, media_type):
+        # Our own write already updated the in-memory data, so it must not trigger a re-parse
+        self._signatures[media_type] = _file_signature(get_store(media_type).files())
+
+
+class LazyDataSources(Mapping):
+    def __init__(self, repository):
+        self.repository = repository
+
+    def __getitem__(self, media_type):
+        if media_type not in CONFIG:
+            raise KeyError(media_type)
+        return self.repository.get(media_type)
+
+    def __iter__(self):
+        return iter(CONFIG)
+
+    def __len__(self):
+        return len(CONFIG)
+
+
+_repository = MediaRepository()
+
+
+def get_repository():
+    return _repository
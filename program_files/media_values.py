@@ -0,0 +1,36 @@
+"""
+Media Values Module
+Helpers for reading the loosely typed values found in the stats files.
+"""
+
+
+def parse_number(value):
+    """Return value as a float, or None for blanks and placeholders such as "N/A".
+
+    Accepts numbers stored as strings, including thousands separators ("46,961,202").
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(str(value).replace(",", "").strip())
+    except ValueError:
+        return None
+
+
+def parse_genres(value):
+    """Return genres as a list; older anime rows store them as one comma-separated string."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [genre.strip() for genre in value.split(",") if genre.strip()]
+    return [genre for genre in value if genre]
+
+
+MISSING_VALUES = (None, '', 'N/A', [])  # What a partial API payload puts in fields it knows nothing about
+
+
+def known_values(entry):
+    """Return entry without its missing values, so merging it never blanks out stored data."""
+    return {field: value for field, value in entry.items() if value not in MISSING_VALUES}
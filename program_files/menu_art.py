@@ -0,0 +1,39 @@
+"""
+Menu Art Module
+Scaled menu button images, built once per session and pre-baked on disk between sessions.
+"""
+
+import os
+import tkinter as tk
+
+BAKED_DIR = "../cache/menu"
+BUTTON_SIZE = (200, 250)
+
+_photos = {}  # (image_path, size) -> PhotoImage, reused on every visit to the menu
+
+
+def _bake(image_path, size):
+    """Return a path to a scaled copy of image_path, rescaling only when the source is newer."""
+    stem = os.path.splitext(os.path.basename(image_path))[0]
+    baked_path = os.path.join(BAKED_DIR, f"{stem}_{size[0]}x{size[1]}.png")
+    source_mtime = os.path.getmtime(image_path)  # FileNotFoundError lets the menu fall back to text buttons
+    if os.path.exists(baked_path) and os.path.getmtime(baked_path) >= source_mtime:
+        return baked_path
+
+    from PIL import Image  # Only needed when an asset changed or on the very first run
+    os.makedirs(BAKED_DIR, exist_ok=True)
+    with Image.open(image_path) as source:
+        scaled = source.resize(size, Image.Resampling.LANCZOS)
+    tmp_path = f"{baked_path}.tmp"
+    scaled.save(tmp_path, format="PNG")
+    os.replace(tmp_path, baked_path)
+    return baked_path
+
+
+def get_button_image(image_path, size=BUTTON_SIZE):
+    """Return the scaled PhotoImage for a menu button."""
+    key = (image_path, size)
+    if key not in _photos:
+        # Tk reads the pre-scaled PNG directly, so no resampling happens on warm starts
+        _photos[key] = tk.PhotoImage(file=_bake(image_path, size))
+    return _photos[key]
@@ -0,0 +1,95 @@
+"""
+Rate Limiter Module
+Per-host token buckets in front of the provider APIs, with Retry-After aware retries.
+"""
+
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+import http_client
+
+# (requests per second, burst size) buckets per host; every bucket must have a token before a call goes out
+HOST_LIMITS = {
+    "api.jikan.moe": [(3, 3), (1, 60)],  # Jikan: 3 per second and 60 per minute
+    "api.themoviedb.org": [(40, 20)],
+    "ws.audioscrobbler.com": [(5, 5)],
+}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRIES = 5
+BASE_BACKOFF = 0.5  # Seconds before the first retry when the server gives no Retry-After
+MAX_BACKOFF = 30
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def reserve(self, now):
+        """Take a token and return how long the caller must wait before using it."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1  # May go negative: later callers queue up behind this reservation
+        return max(0.0, -self.tokens / self.rate)
+
+
+class HostScheduler:
+    def __init__(self, limits):
+        self.buckets = [TokenBucket(rate, capacity) for rate, capacity in limits]
+        self.blocked_until = 0.0  # Set when the host tells us to back off
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until this host may receive another request."""
+        with self._lock:
+            now = time.monotonic()
+            wait = max(bucket.reserve(now) for bucket in self.buckets)
+            wait = max(wait, self.blocked_until - now)
+        if wait > 0:
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        """Hold back every caller for this host, not just the one that was throttled."""
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+_schedulers = {host: HostScheduler(limits) for host, limits in HOST_LIMITS.items()}
+
+
+def retry_delay(response, attempt):
+    """Honor Retry-After (seconds or HTTP date), else use jittered exponential backoff."""
+    retry_after = response.headers.get("Retry-After")
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            try:
+                retry_at = parsedate_to_datetime(retry_after)
+                return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+            except (TypeError, ValueError):
+                pass
+    return random.uniform(BASE_BACKOFF, min(MAX_BACKOFF, BASE_BACKOFF * 2 ** attempt))
+
+
+def get(url, **kwargs):
+    """http_client.get that waits for its host's rate limit and retries throttled responses."""
+    scheduler = _schedulers.get(urlsplit(url).hostname)
+    for attempt in range(MAX_RETRIES + 1):
+        if scheduler:
+            scheduler.acquire()
+        response = http_client.get(url, **kwargs)
+        if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+            return response
+        delay = retry_delay(response, attempt)
+        response.close()  # Hand the connection back to the pool before waiting
+        print(f"HTTP {response.status_code} from {url}, retrying in {delay:.1f}s")
+        if scheduler:
+            scheduler.pause(delay)
+        else:
+            time.sleep(delay)
@@ -0,0 +1,191 @@
+"""
+Response Cache Module
+TTL + LRU cache for search and detail API responses, with an optional on-disk tier.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from single_flight import SingleFlight
+
+DISK_CACHE_DIR = "../cache/responses"
+SEARCH_TTL = 60 * 60  # Search results change as providers add titles, so keep them for an hour
+DETAILS_TTL = 7 * 24 * 60 * 60  # Detail payloads are stable; a week is plenty
+MAX_MEMORY_ENTRIES = 512
+MAX_DISK_BYTES = 50 * 1024 * 1024  # Per cache; the oldest responses are removed beyond this
+
+
+def normalize_key(key):
+    """Case-fold and collapse whitespace in string parts so equivalent queries share an entry."""
+    return tuple(" ".join(part.casefold().split()) if isinstance(part, str) else part for part in key)
+
+
+class ResponseCache:
+    def __init__(self, name, ttl, max_entries=MAX_MEMORY_ENTRIES, disk_dir=DISK_CACHE_DIR,
+                 max_disk_bytes=MAX_DISK_BYTES):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.disk_dir = os.path.join(disk_dir, name) if disk_dir else None  # None disables the disk tier
+        self.max_disk_bytes = max_disk_bytes
+        self._entries = OrderedDict()  # Normalized key -> (expires_at, value), oldest first
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        self._disk_bytes = None  # Computed on first write so startup never walks the cache
+
+    def get(self, key):
+        """Return the cached value for key, or None if it is missing or expired."""
+        key = normalize_key(key)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    return entry[1]
+                del self._entries[key]
+
+        entry = self._read_disk(key)
+        if entry is None:
+            return None
+        if entry[0] <= now:
+            self._remove_expired_disk(key)
+            return None
+        with self._lock:
+            self._remember(key, entry)
+        return entry[1]
+
+    def put(self, key, value):
+        key = normalize_key(key)
+        entry = (time.time() + self.ttl, value)
+        with self._lock:
+            self._remember(key, entry)
+        self._write_disk(key, entry)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _remember(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)  # Evict the least recently used response
+
+    def _disk_path(self, key):
+        digest = hashlib.sha256(json.dumps(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.disk_dir, f"{digest}.json")
+
+    def _read_disk(self, key):
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._disk_path(key), "r") as file:
+                stored = json.load(file)
+            return stored["expires_at"], stored["value"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _remove_expired_disk(self, key):
+        path = self._disk_path(key)
+        with self._disk_lock:
+            try:
+                stat = os.stat(path)
+                if stat.st_mtime > time.time() - self.ttl:
+                    return  # Rewritten with a fresh response since it was read
+                os.remove(path)
+            except OSError:
+                return
+            size = stat.st_size
+            if self._disk_bytes is not None:
+                self._disk_bytes -= size
+
+    def _write_disk(self, key, entry):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        try:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w") as file:
+                json.dump({"expires_at": entry[0], "value": entry[1]}, file)
+            with self._disk_lock:
+                try:
+                    replaced = os.path.getsize(path)
+                except FileNotFoundError:
+                    replaced = 0
+                os.replace(tmp_path, path)
+                if self._disk_bytes is None:
+                    self._disk_bytes = sum(size for _, size, _ in self._scan_disk())
+                else:
+                    self._disk_bytes += os.path.getsize(path) - replaced
+                if self._disk_bytes > self.max_disk_bytes:
+                    self._evict_disk()
+        except (OSError, TypeError) as e:
+            print(f"Could not write {self.name} cache entry: {e}")
+
+    def _scan_disk(self):
+        """Yield (path, size, mtime) for every stored response; mtime is when it was written."""
+        for filename in os.listdir(self.disk_dir):
+            if not filename.endswith(".json"):
+                continue
+            path = os.path.join(self.disk_dir, filename)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            yield path, stat.st_size, stat.st_mtime
+
+    def _evict_disk(self):
+        # Every entry lives for ttl from its write, so the oldest files are the expired ones; drop those,
+        # then keep going oldest first until comfortably below the cap
+        target = int(self.max_disk_bytes * 0.9)
+        expired_before = time.time() - self.ttl
+        entries = sorted(self._scan_disk(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        for path, size, written in entries:
+            if total <= target and written > expired_before:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except FileNotFoundError:
+                pass
+        self._disk_bytes = total
+
+
+SEARCH_CACHE = ResponseCache("search", SEARCH_TTL)
+DETAILS_CACHE = ResponseCache("details", DETAILS_TTL)
+
+
+_flights = SingleFlight()  # Shared by every cache; keys are prefixed with the cache name
+
+
+def cached(cache, make_key):
+    """Decorator caching a method's non-empty results under make_key(*args).
+
+    Concurrent misses on the same key from worker threads share a single fetch. Every caller gets the
+    same cached object, so results must not be modified in place.
+    """
+    def decorator(fetch):
+        def fetch_and_store(key, *args):
+            value = cache.get(key)  # A call that just finished may have stored it
+            if value is None:
+                value = fetch(*args)
+                if value:  # Errors come back as [] or None and must not be cached
+                    cache.put(key, value)
+            return value
+
+        @functools.wraps(fetch)
+        def wrapper(*args):
+            key = make_key(*args)
+            value = cache.get(key)
+            if value is None:
+                value = _flights.do((cache.name,) + normalize_key(key), fetch_and_store, key, *args)
+            return value
+        return wrapper
+    return decorator
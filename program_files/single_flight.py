@@ -0,0 +1,54 @@
+"""
+Single Flight Module
+Coalesces concurrent calls that share a key: the first caller runs the work, later callers wait for it
+and receive the same result (or the same exception) instead of repeating the network call.
+
+Only worker threads ever wait. A call from the main thread never joins one in flight, since blocking
+there would freeze the Tk event loop for as long as someone else's request takes.
+
+Waiters receive the very object the leader produced (a parsed response, a PIL image), not a copy, so
+results must be treated as read-only.
+"""
+
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls = {}  # Key -> _Call currently in flight
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, *args):
+        """Return fn(*args), sharing one execution among all worker-thread callers that overlap on key."""
+        if threading.current_thread() is threading.main_thread():
+            return fn(*args)
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            # Forget the call before waking waiters, so a later request after this one starts afresh
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
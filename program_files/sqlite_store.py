@@ -0,0 +1,284 @@
+"""
+SQLite Store Module
+Optional storage backend with one table per media type, a unique index on the CONFIG id_fields
+and secondary indexes on score and genre. Exposes the same load/add/update/delete interface as
+the journal store, plus indexed lookups and JSON import/export.
+"""
+
+import json
+import sqlite3
+import threading
+from media_config import CONFIG
+from journal_store import JournalStore
+from media_values import parse_genres
+
+DB_PATH = "../statistics/media_library.db"
+LIST_COLUMNS = {"genres"}  # Stored as JSON text and mirrored into the <type>_genres index table
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _score_columns(columns):
+    return [column for column in columns if "score" in column]
+
+
+class SQLiteStore:
+    def __init__(self, connection, lock, media_type):
+        self.connection = connection
+        self._lock = lock
+        self.media_type = media_type
+        self.conf = CONFIG[media_type]
+        self.columns = list(self.conf["data_structure"])
+        self.table = _quote(media_type)
+        self.genre_table = _quote(f"{media_type}_genres")
+        self.merged_on_import = 0  # Duplicate rows the unique index folded together during import_json
+        self._create_schema()
+        if self._row_count() == 0:
+            # First use: transparently pull in whatever the JSON snapshot and journal hold
+            self.import_json(self.conf["file_path"])
+
+    def _create_schema(self):
+        # NUMERIC affinity turns numeric strings like "8" into numbers so score ranges can use the index
+        column_sql = ", ".join(
+            f"{_quote(column)} NUMERIC" if column in _score_columns(self.columns) else _quote(column)
+            for column in self.columns
+        )
+        id_sql = ", ".join(f"{_quote(column)} COLLATE NOCASE" for column in self.conf["id_fields"])
+        with self._lock, self.connection:
+            # position is the row's index in the columnar data the GUI sees; deletes renumber the rows after it
+            self.connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} (id INTEGER PRIMARY KEY, position INTEGER, {column_sql})"
+            )
+            existing = [row[1] for row in self.connection.execute(f"PRAGMA table_info({self.table})")]
+            if "position" not in existing:
+                # Libraries created before the position column: number the rows in their insertion order
+                self.connection.execute(f"ALTER TABLE {self.table} ADD COLUMN position INTEGER")
+                self.connection.execute(
+                    f"UPDATE {self.table} SET position = ("
+                    f"SELECT ranked.position FROM (SELECT id, ROW_NUMBER() OVER (ORDER BY id) - 1 AS position "
+                    f"FROM {self.table}) ranked WHERE ranked.id = {self.table}.id)"
+                )
+            self.connection.execute(
+                f"CREATE UNIQUE INDEX IF NOT EXISTS {_quote(self.media_type + '_position')} ON {self.table} (position)"
+            )
+            self.connection.execute(
+                f"CREATE UNIQUE INDEX IF NOT EXISTS {_quote(self.media_type + '_id')} ON {self.table} ({id_sql})"
+            )
+            for column in _score_columns(self.columns):
+                self.connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS {_quote(self.media_type + '_' + column)} ON {self.table} ({_quote(column)})"
+                )
+            self.connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.genre_table} "
+                f"(entry_id INTEGER NOT NULL REFERENCES {self.table}(id) ON DELETE CASCADE, genre TEXT NOT NULL COLLATE NOCASE)"
+            )
+            self.connection.execute(
+                f"CREATE INDEX IF NOT EXISTS {_quote(self.media_type + '_genre')} ON {self.genre_table} (genre, entry_id)"
+            )
+
+    def _row_count(self):
+        with self._lock:
+            return self.connection.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def _encode(self, column, value):
+        return json.dumps(value) if column in LIST_COLUMNS else value
+
+    def _decode_row(self, row):
+        entry = {}
+        for column, value in zip(self.columns, row):
+            entry[column] = json.loads(value) if column in LIST_COLUMNS and value is not None else value
+        return entry
+
+    def _upsert(self, entry):
+        """Insert entry, or update the row with the same id fields in place; True if it was an update."""
+        column_sql = ", ".join(["position"] + [_quote(column) for column in self.columns])
+        placeholders = ", ".join("?" for _ in range(len(self.columns) + 1))
+        id_sql = ", ".join(f"{_quote(column)} COLLATE NOCASE" for column in self.conf["id_fields"])
+        update_sql = ", ".join(f"{_quote(column)} = excluded.{_quote(column)}" for column in self.columns)
+        last_id, next_position = self.connection.execute(
+            f"SELECT COALESCE(MAX(id), 0), COALESCE(MAX(position) + 1, 0) FROM {self.table}"
+        ).fetchone()
+        # The position is only used by a real insert; an update keeps the row where it is
+        values = [next_position] + [self._encode(column, entry.get(column)) for column in self.columns]
+        entry_id = self.connection.execute(
+            f"INSERT INTO {self.table} ({column_sql}) VALUES ({placeholders}) "
+            f"ON CONFLICT ({id_sql}) DO UPDATE SET {update_sql} RETURNING id",
+            values
+        ).fetchone()[0]
+        self._index_genres(entry_id, entry)
+        # A fresh row always gets an id above the current maximum; an update keeps its old one
+        return entry_id <= last_id
+
+    def _index_genres(self, entry_id, entry):
+        self.connection.execute(f"DELETE FROM {self.genre_table} WHERE entry_id = ?", (entry_id,))
+        self.connection.executemany(
+            f"INSERT INTO {self.genre_table} (entry_id, genre) VALUES (?, ?)",
+            [(entry_id, genre) for genre in parse_genres(entry.get("genres"))]
+        )
+
+    def _id_at(self, index):
+        row = self.connection.execute(f"SELECT id FROM {self.table} WHERE position = ?", (index,)).fetchone()
+        if row is None:
+            raise IndexError(index)
+        return row[0]
+
+    # Same interface as JournalStore
+    def files(self):
+        """Paths whose modification means the stored data changed."""
+        database = self.connection.execute("PRAGMA database_list").fetchone()[2]
+        return [database, f"{database}-wal"]
+
+    def load(self):
+        """Return all rows as the columnar dict the GUI expects, in insertion order."""
+        data = {column: [] for column in self.columns}
+        for entry in self.rows():
+            for column in self.columns:
+                data[column].append(entry[column])
+        return data
+
+    def add(self, entry):
+        self.add_many([entry])
+
+    def add_many(self, entries):
+        """Insert entries, updating rows whose id fields already exist; returns how many were merged."""
+        with self._lock, self.connection:
+            return sum(self._upsert(entry) for entry in entries)
+
+    def update(self, index, entry):
+        """Overwrite the given fields of row index."""
+        with self._lock, self.connection:
+            self._update(index, entry)
+
+    def delete(self, index):
+        with self._lock, self.connection:
+            self._delete(index)
+
+    def write_batch(self, records):
+        """Apply several journal-style add/update/delete records in one transaction.
+
+        Returns how many "add" records matched an existing row and updated it instead.
+        """
+        merged = 0
+        with self._lock, self.connection:
+            for record in records:
+                if record["op"] == "add":
+                    merged += self._upsert(record["entry"])
+                elif record["op"] == "update":
+                    self._update(record["index"], record["entry"])
+                elif record["op"] == "delete":
+                    self._delete(record["index"])
+        return merged
+
+    def _update(self, index, entry):
+        entry_id = self._id_at(index)
+        assignments = ", ".join(f"{_quote(column)} = ?" for column in entry)
+        values = [self._encode(column, value) for column, value in entry.items()]
+        self.connection.execute(f"UPDATE {self.table} SET {assignments} WHERE id = ?", values + [entry_id])
+        if "genres" in entry:
+            self._index_genres(entry_id, entry)
+
+    def _delete(self, index):
+        entry_id = self._id_at(index)
+        self.connection.execute(f"DELETE FROM {self.genre_table} WHERE entry_id = ?", (entry_id,))
+        self.connection.execute(f"DELETE FROM {self.table} WHERE id = ?", (entry_id,))
+        # Shift in ascending order so the unique position index never sees two equal values
+        for (later_id,) in self.connection.execute(
+            f"SELECT id FROM {self.table} WHERE position > ? ORDER BY position", (index,)
+        ).fetchall():
+            self.connection.execute(f"UPDATE {self.table} SET position = position - 1 WHERE id = ?", (later_id,))
+
+    # Indexed queries
+    def rows(self, where="", params=(), order_by="position", descending=False):
+        column_sql = ", ".join(f"t.{_quote(column)}" for column in self.columns)
+        direction = "DESC" if descending else "ASC"
+        with self._lock:
+            cursor = self.connection.execute(
+                f"SELECT {column_sql} FROM {self.table} t {where} ORDER BY t.{_quote(order_by)} {direction}", params
+            )
+            return [self._decode_row(row) for row in cursor.fetchall()]
+
+    def find(self, entry):
+        """Return the index of the row with the same id fields as entry (case-insensitive), or None."""
+        where = " AND ".join(f"{_quote(column)} = ? COLLATE NOCASE" for column in self.conf["id_fields"])
+        with self._lock:
+            row = self.connection.execute(
+                f"SELECT position FROM {self.table} WHERE {where}",
+                [entry.get(column) for column in self.conf["id_fields"]]
+            ).fetchone()
+        return row[0] if row else None
+
+    def dedupe(self):
+        """The unique id index keeps duplicates out of the table, so the only rows ever collapsed are the
+        ones import_json merged; returns how many that was since the last call."""
+        merged, self.merged_on_import = self.merged_on_import, 0
+        return merged
+
+    def filter(self, genre=None, min_score=None, score_column=None, order_by="position", descending=False):
+        """Rows matching a genre and/or minimum score, resolved through the secondary indexes."""
+        clauses, params = [], []
+        if genre:
+            clauses.append(f"t.id IN (SELECT entry_id FROM {self.genre_table} WHERE genre = ?)")
+            params.append(genre)
+        if min_score is not None:
+            column = score_column or _score_columns(self.columns)[0]
+            # Non-numeric placeholders such as "N/A" sort above every number in SQLite, so exclude them
+            clauses.append(f"t.{_quote(column)} >= ? AND typeof(t.{_quote(column)}) IN ('integer', 'real')")
+            params.append(min_score)
+        where = "WHERE " + " AND ".join(clauses) if clauses else ""
+        return self.rows(where, params, order_by, descending)
+
+    # JSON interchange
+    def import_json(self, file_path=None):
+        """Load a stats file (plus its journal, if any) in the existing JSON format."""
+        journal = JournalStore(file_path or self.conf["file_path"], self.conf["data_structure"], self.conf["id_fields"],
+                               number_fields=self.conf["number_fields"])
+        data = journal.load()
+        row_count = len(data[self.columns[0]]) if self.columns[0] in data else 0
+        entries = [{column: data.get(column, [None] * row_count)[i] for column in self.columns} for i in range(row_count)]
+        merged = self.add_many(entries)
+        if merged:
+            print(f"Merged {merged} duplicate {self.media_type} entr{'y' if merged == 1 else 'ies'} while importing")
+        self.merged_on_import += merged
+        return len(entries) - merged
+
+    def export_json(self, file_path=None):
+        """Write this table in the existing columnar JSON format."""
+        journal = JournalStore(file_path or self.conf["file_path"], self.conf["data_structure"], self.conf["id_fields"],
+                               number_fields=self.conf["number_fields"])
+        journal.replace(self.load())
+
+
+_connection = None
+_connection_lock = threading.RLock()
+_stores = {}
+
+
+def get_store(media_type, db_path=DB_PATH):
+    """Return the process-wide SQLite store for a media type."""
+    global _connection
+    with _connection_lock:
+        if _connection is None:
+            _connection = sqlite3.connect(db_path, check_same_thread=False)
+            _connection.execute("PRAGMA foreign_keys = ON")
+            _connection.execute("PRAGMA journal_mode = WAL")
+        if media_type not in _stores:
+            _stores[media_type] = SQLiteStore(_connection, _connection_lock, media_type)
+        return _stores[media_type]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Copy stats between the JSON files and the SQLite library.")
+    parser.add_argument("direction", choices=["import", "export"])
+    parser.add_argument("media_types", nargs="*", default=list(CONFIG))
+    args = parser.parse_args()
+    for media_type in args.media_types:
+        store = get_store(media_type)
+        if args.direction == "import":
+            print(f"Imported {store.import_json()} {media_type} rows")
+        else:
+            store.export_json()
+            print(f"Exported {media_type} to {store.conf['file_path']}")
@@ -0,0 +1,227 @@
+"""
+Stats Engine Module
+Aggregates over the columnar stats data using NumPy: per-genre mean personal score, personal vs public
+score deltas, score histograms and per-artist / per-year breakdowns.
+
+Columns are parsed once into typed arrays (NaN marks a missing score). Group totals are kept as running
+sums, so adding a row updates them without recomputing from scratch. NumPy is imported on first use,
+keeping it off the startup path.
+"""
+
+from media_config import CONFIG
+from media_repository import get_repository
+from media_values import parse_number, parse_genres
+
+HISTOGRAM_BINS = 10  # One bin per point on the 0-10 scales used by every provider
+
+np = None
+
+
+def _numpy():
+    global np
+    if np is None:
+        import numpy
+        np = numpy
+    return np
+
+
+class _GrowingArray:
+    """Float array with amortised O(1) append; values() is a view of the filled part."""
+
+    def __init__(self, values):
+        self._array = _numpy().asarray(values, dtype=np.float64)
+        self._size = len(self._array)
+
+    def append(self, value):
+        if self._size == len(self._array):
+            grown = np.empty(max(16, 2 * self._size), dtype=np.float64)
+            grown[:self._size] = self._array[:self._size]
+            self._array = grown
+        self._array[self._size] = value
+        self._size += 1
+
+    def values(self):
+        return self._array[:self._size]
+
+
+class _GroupTotals:
+    """Running count, personal-score sum and scored-row count per label (genre, artist or year)."""
+
+    def __init__(self, labels_per_row, personal):
+        self.codes = {}  # Label -> position in the arrays below
+        rows, codes = [], []
+        for row, labels in enumerate(labels_per_row):
+            for label in labels:
+                rows.append(row)
+                codes.append(self.codes.setdefault(label, len(self.codes)))
+        rows = np.asarray(rows, dtype=np.intp)
+        codes = np.asarray(codes, dtype=np.intp)
+        size = len(self.codes)
+        values = personal[rows] if len(rows) else np.empty(0)
+        scored = ~np.isnan(values)
+        self.entries = np.bincount(codes, minlength=size).astype(np.float64)
+        self.scored = np.bincount(codes[scored], minlength=size).astype(np.float64)
+        self.sums = np.bincount(codes[scored], weights=values[scored], minlength=size)
+
+    def add(self, labels, personal):
+        for label in labels:
+            code = self.codes.get(label)
+            if code is None:
+                code = self.codes[label] = len(self.codes)
+                self.entries, self.scored, self.sums = (np.append(array, 0.0)
+                                                        for array in (self.entries, self.scored, self.sums))
+            self.entries[code] += 1
+            if not np.isnan(personal):
+                self.scored[code] += 1
+                self.sums[code] += personal
+
+    def table(self):
+        """Return [(label, entries, mean personal score or None)], most entries first."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = self.sums / self.scored
+        order = np.lexsort((-np.nan_to_num(means, nan=-1.0), -self.entries))
+        labels = list(self.codes)
+        return [(labels[i], int(self.entries[i]), None if np.isnan(means[i]) else float(means[i])) for i in order]
+
+
+def _year_from(media_type, value):
+    # Anime and manga keep the year in personal_comments; movies and TV in release_date
+    if media_type in ('movie', 'tv'):
+        value = str(value or '')[:4]
+    year = parse_number(value)
+    return [int(year)] if year is not None else []
+
+
+def _year_field(media_type):
+    return {'anime': 'personal_comments', 'manga': 'personal_comments',
+            'movie': 'release_date', 'tv': 'release_date'}.get(media_type)
+
+
+def _year(media_type, entry):
+    field = _year_field(media_type)
+    return _year_from(media_type, entry.get(field)) if field else []
+
+
+def _row_count(data):
+    """Number of rows in columnar data; every column must have exactly that many."""
+    lengths = {column: len(values) for column, values in data.items()}
+    count = next(iter(lengths.values()), 0)
+    ragged = {column: length for column, length in lengths.items() if length != count}
+    if ragged:
+        raise ValueError(f"columns have unequal lengths: expected {count} rows, got {ragged}")
+    return count
+
+
+class MediaStats:
+    def __init__(self, media_type, data):
+        _numpy()
+        self.media_type = media_type
+        self.data = data
+        self.conf = CONFIG[media_type]
+        count = _row_count(data)
+        self.personal = _GrowingArray(self._number_column(self.conf['personal_score_field'], count))
+        self.public = _GrowingArray(self._number_column(self.conf['score_field'], count))
+        personal = self.personal.values()
+        self.genres = _GroupTotals(map(parse_genres, data.get('genres', [[]] * count)), personal)
+        year_field = _year_field(media_type)
+        self.years = _GroupTotals(
+            [_year_from(media_type, value) for value in data.get(year_field, [])] if year_field else [], personal
+        )
+        self.artists = (_GroupTotals([[artist] for artist in data['artist']], personal)
+                        if media_type == 'music' else None)
+
+    def _number_column(self, field, count):
+        """Parse a whole score column into a float64 array, NaN marking missing values."""
+        if not field or field not in self.data:
+            return np.full(count, np.nan)
+        column = self.data[field]
+        mapped = column.mapped_numbers() if hasattr(column, 'mapped_numbers') else None
+        if mapped is not None:
+            # Already parsed into the binary snapshot; only patch the rows the journal touched since
+            numbers, changed = mapped
+            array = np.empty(count, dtype=np.float64)
+            array[:len(numbers)] = numbers
+            for row, value in changed.items():
+                number = parse_number(value)
+                array[row] = np.nan if number is None else number
+            return array
+        return np.fromiter((np.nan if n is None else n for n in map(parse_number, column)),
+                           dtype=np.float64, count=count)
+
+    def _number(self, entry, field_key):
+        field = self.conf[field_key]
+        value = parse_number(entry.get(field)) if field else None
+        return np.nan if value is None else value
+
+    def add(self, entry):
+        """Fold one newly added row into the arrays and running totals."""
+        personal = self._number(entry, 'personal_score_field')
+        self.personal.append(personal)
+        self.public.append(self._number(entry, 'score_field'))
+        self.genres.add(parse_genres(entry.get('genres')), personal)
+        self.years.add(_year(self.media_type, entry), personal)
+        if self.artists is not None:
+            self.artists.add([entry.get('artist')], personal)
+
+    def summary(self, top=5):
+        personal = self.personal.values()
+        public = self.public.values()
+        scored = personal[~np.isnan(personal)]
+        edges = np.linspace(0, 10, HISTOGRAM_BINS + 1)
+        summary = {
+            "entries": len(personal),
+            "scored": len(scored),
+            "mean_personal": float(scored.mean()) if len(scored) else None,
+            "personal_histogram": np.histogram(np.clip(scored, 0, 10), bins=edges)[0].tolist(),
+            "histogram_edges": edges.tolist(),
+            "genres": self.genres.table(),
+            "years": sorted(self.years.table()),
+            "artists": self.artists.table() if self.artists is not None else [],
+        }
+        if self.conf['score_field']:
+            both = ~np.isnan(personal) & ~np.isnan(public)
+            deltas = personal[both] - public[both]
+            rated = public[~np.isnan(public)]
+            title_column = self.data[self.conf['title_field']]
+            if len(title_column) != len(personal):
+                raise ValueError(f"{len(title_column)} titles for {len(personal)} scored rows")
+            titles = [title_column[row] for row in np.flatnonzero(both)]
+            order = np.argsort(deltas)
+            summary.update(
+                mean_public=float(rated.mean()) if len(rated) else None,
+                public_histogram=np.histogram(np.clip(rated, 0, 10), bins=edges)[0].tolist(),
+                mean_delta=float(deltas.mean()) if len(deltas) else None,
+                # Where your opinion differs most from the crowd, in either direction
+                most_overrated=[(titles[i], float(deltas[i])) for i in order[:top] if deltas[i] < 0],
+                most_underrated=[(titles[i], float(deltas[i])) for i in order[::-1][:top] if deltas[i] > 0],
+            )
+        return summary
+
+
+_stats = {}
+_subscribed = False
+
+
+def _on_write(media_type, record, data):
+    stats = _stats.get(media_type)
+    if stats is None or stats.data is not data:
+        return
+    if record["op"] == "add":
+        stats.add(record["entry"])
+    else:
+        _stats.pop(media_type)  # Updates and deletes are rare; rebuild on the next request
+
+
+def get_stats(media_type):
+    """Return the summary for a media type, building the arrays on first use."""
+    global _subscribed
+    repository = get_repository()
+    with repository.lock(media_type):
+        if not _subscribed:
+            repository.subscribe(_on_write)
+            _subscribed = True
+        data = repository.get(media_type)
+        stats = _stats.get(media_type)
+        if stats is None or stats.data is not data:
+            stats = _stats[media_type] = MediaStats(media_type, data)
+        return stats.summary()
@@ -0,0 +1,15 @@
+"""
+Storage Module
+Picks the persistence backend configured in media_config.STORAGE_BACKEND.
+"""
+
+import media_config
+
+
+def get_store(media_type):
+    """Return the store for a media type: load() / add() / update() / delete() on columnar stats."""
+    if media_config.STORAGE_BACKEND == "sqlite":
+        import sqlite_store  # Only pay for sqlite3 when the backend is actually selected
+        return sqlite_store.get_store(media_type)
+    import journal_store
+    return journal_store.get_store(media_type)
@@ -0,0 +1,117 @@
+"""
+Text Index Module
+Trigram index over the titles, artists and genres of one media type, for fuzzy local-library search.
+Matching on shared trigrams tolerates typos and partial words, which suits long romanized titles.
+"""
+
+import heapq
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from media_values import parse_genres
+
+MIN_OVERLAP = 0.4  # Share of the query's trigrams a row must contain to count as a match
+MAX_CACHED_WORDS = 200_000
+
+
+def normalize_text(text):
+    """Lower-case, strip accents and collapse everything but letters and digits to single spaces."""
+    text = str(text or "")
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    return " ".join(re.findall(r"[a-z0-9]+", text.lower()))
+
+
+_word_grams = {}  # Word -> its padded trigrams; titles and genres repeat words, so each is split once
+
+
+def _word_trigrams(word):
+    grams = _word_grams.get(word)
+    if grams is None:
+        padded = f"  {word} "
+        grams = frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+        if len(_word_grams) < MAX_CACHED_WORDS:
+            _word_grams[word] = grams
+    return grams
+
+
+def _normalized_trigrams(normalized):
+    return set().union(*map(_word_trigrams, normalized.split()))
+
+
+def trigrams(text):
+    """Return the set of trigrams of normalized text; words are padded so short words still match."""
+    return _normalized_trigrams(normalize_text(text))
+
+
+class TrigramIndex:
+    def __init__(self, text_fields):
+        self.text_fields = text_fields
+        self._postings = {}  # Trigram -> set of rows containing it
+        self._row_grams = []  # Row -> its trigrams, so an updated row can be unindexed
+        self._row_text = []  # Row -> normalized text, for the substring bonus
+
+    def row_text(self, entry):
+        parts = []
+        for field in self.text_fields:
+            value = entry.get(field)
+            parts.extend(parse_genres(value) if field == 'genres' else [value])
+        return " ".join(str(part) for part in parts if part)
+
+    def build(self, data):
+        columns = [data.get(field, []) for field in self.text_fields]
+        postings = defaultdict(list)  # Appending to lists and converting once is far cheaper than set.add
+        self._row_grams, self._row_text = [], []
+        for row, values in enumerate(zip(*columns)):
+            text = normalize_text(self.row_text(dict(zip(self.text_fields, values))))
+            grams = _normalized_trigrams(text)
+            self._row_grams.append(grams)
+            self._row_text.append(text)
+            for gram in grams:
+                postings[gram].append(row)
+        self._postings = {gram: set(rows) for gram, rows in postings.items()}
+        return self
+
+    def add(self, entry):
+        self._row_grams.append(set())
+        self._row_text.append("")
+        self._index(len(self._row_grams) - 1, entry)
+
+    def update(self, row, entry):
+        """Re-index row from entry, which holds the row's full current text fields."""
+        for gram in self._row_grams[row]:
+            self._postings[gram].discard(row)
+        self._index(row, entry)
+
+    def _index(self, row, entry):
+        text = normalize_text(self.row_text(entry))
+        grams = _normalized_trigrams(text)
+        self._row_grams[row] = grams
+        self._row_text[row] = text
+        postings = self._postings
+        for gram in grams:
+            rows = postings.get(gram)
+            if rows is None:
+                rows = postings[gram] = set()
+            rows.add(row)
+
+    def search(self, query, limit=None, rows=None):
+        """Return [(score, row)] best first; score is the share of query trigrams found, plus a bonus
+        for rows containing the query verbatim. Only rows in the rows set are considered, if given,
+        and only the best limit matches are ranked and returned."""
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+        hits = Counter()
+        for gram in query_grams:
+            hits.update(self._postings.get(gram, ()))
+        total = len(query_grams)
+        needed = max(1, int(total * MIN_OVERLAP))
+        phrase = normalize_text(query)
+        matches = ((row, count) for row, count in hits.items()
+                   if count >= needed and (rows is None or row in rows))
+        scored = ((count / total + (0.5 if phrase in self._row_text[row] else 0), -row)
+                  for row, count in matches)
+        # Ties go to the older row; negating it lets one key rank both ways
+        best = heapq.nlargest(limit, scored) if limit else sorted(scored, reverse=True)
+        return [(score, -row) for score, row in best]
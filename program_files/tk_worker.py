@@ -0,0 +1,75 @@
+"""
+Tk Worker Module
+Runs blocking work on a bounded thread pool and hands results back on the Tk main thread.
+"""
+
+import queue
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+
+POLL_INTERVAL_MS = 30
+
+
+class TkTask:
+    """Handle for a submitted job; cancelling it guarantees its callbacks never run."""
+
+    def __init__(self, future, on_done, on_error):
+        self.future = future
+        self.on_done = on_done
+        self.on_error = on_error
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+        self.future.cancel()  # Only succeeds if the job has not started yet
+
+
+class TkWorkerPool:
+    def __init__(self, root, max_workers=4, name="tk-worker"):
+        self.root = root
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._finished = queue.SimpleQueue()  # Filled by worker threads, drained on the main thread
+        self._pending = set()
+        self._poll_id = None
+
+    def submit(self, fn, *args, on_done=None, on_error=None):
+        """Run fn(*args) off the main thread; callbacks are invoked via root.after."""
+        future = self._executor.submit(fn, *args)
+        task = TkTask(future, on_done, on_error)
+        self._pending.add(task)
+        future.add_done_callback(lambda _f: self._finished.put(task))
+        self._schedule_poll()
+        return task
+
+    def cancel_all(self):
+        for task in list(self._pending):
+            task.cancel()
+
+    def _schedule_poll(self):
+        if self._poll_id is None:
+            try:
+                self._poll_id = self.root.after(POLL_INTERVAL_MS, self._poll)
+            except tk.TclError:
+                pass  # Root window already destroyed
+
+    def _poll(self):
+        self._poll_id = None
+        while True:
+            try:
+                task = self._finished.get_nowait()
+            except queue.Empty:
+                break
+            self._pending.discard(task)
+            if task.cancelled or task.future.cancelled():
+                continue
+            error = task.future.exception()
+            try:
+                if error is not None:
+                    if task.on_error:
+                        task.on_error(error)
+                elif task.on_done:
+                    task.on_done(task.future.result())
+            except tk.TclError:
+                pass  # The widget the callback targets was destroyed in the meantime
+        if self._pending:
+            self._schedule_poll()
@@ -0,0 +1,81 @@
+"""
+Virtual List Module
+Scrolling card list that only keeps widgets for the visible rows and recycles them while scrolling.
+"""
+
+import tkinter as tk
+from tkinter import ttk
+
+ROW_HEIGHT = 190  # 180px card plus 5px padding above and below
+CARD_PADDING = 5
+OVERSCAN = 2  # Extra rows kept alive above and below the viewport for smooth scrolling
+OFFSCREEN_Y = -10000  # Idle pooled cards are parked here instead of being destroyed
+
+
+class VirtualCardList:
+    def __init__(self, parent, rows, row_height=ROW_HEIGHT, overscan=OVERSCAN):
+        """rows is any sequence whose items are (card_class, card_fields) tuples."""
+        self.rows = rows
+        self.row_height = row_height
+        self.overscan = overscan
+        self.visible = {}  # Row index -> card currently showing that row
+        self.pool = {}  # Card class -> idle cards ready to be rebound to another row
+        self.window_ids = {}  # Card -> canvas window item holding its frame
+
+        self.scrollbar = ttk.Scrollbar(parent, orient="vertical")
+        self.canvas = tk.Canvas(parent, borderwidth=0, background="#f0f0f0",
+                                yscrollcommand=self._on_view_changed)
+        self.scrollbar.configure(command=self.canvas.yview)
+
+        # Position scrollbar and canvas
+        self.scrollbar.pack(side="right", fill="y")  # Right side, fill vertically
+        self.canvas.pack(side="left", fill="both", expand=True)  # Left side, fill all space
+
+        self.canvas.bind("<Configure>", lambda event: self.refresh())
+        self.set_rows(rows)
+
+    def set_rows(self, rows):
+        """Swap in a new row sequence (e.g. after sorting) and redraw from the top."""
+        self.rows = rows
+        self.canvas.configure(scrollregion=(0, 0, 0, len(rows) * self.row_height))
+        for index in list(self.visible):
+            self._release(index)
+        self.canvas.yview_moveto(0)
+        self.refresh()
+
+    def _on_view_changed(self, first, last):
+        # Every scroll source (scrollbar, keyboard, resize) ends up here
+        self.scrollbar.set(first, last)
+        self.refresh()
+
+    def refresh(self):
+        top = self.canvas.canvasy(0)
+        height = max(self.canvas.winfo_height(), self.row_height)
+        first = max(0, int(top // self.row_height) - self.overscan)
+        last = min(len(self.rows), int((top + height) // self.row_height) + 1 + self.overscan)
+
+        for index in [i for i in self.visible if i < first or i >= last]:
+            self._release(index)
+        for index in range(first, last):
+            if index not in self.visible:
+                self._bind(index)
+
+    def _bind(self, index):
+        card_class, fields = self.rows[index]
+        y = index * self.row_height + CARD_PADDING
+        idle = self.pool.get(card_class)
+        if idle:
+            card = idle.pop()
+            card.update_card(**fields)
+            self.canvas.coords(self.window_ids[card], 0, y)
+        else:
+            card = card_class(parent=self.canvas, **fields)
+            card.create_card(pack=False)
+            self.window_ids[card] = self.canvas.create_window(0, y, window=card.card_frame, anchor="nw")
+        self.visible[index] = card
+
+    def _release(self, index):
+        card = self.visible.pop(index)
+        card.release_image()  # Parked cards give up their cover so the image budget can reclaim it
+        self.canvas.coords(self.window_ids[card], 0, OFFSCREEN_Y)
+        self.pool.setdefault(type(card), []).append(card)
@@ -0,0 +1,69 @@
+import math
+import os
+
+from binary_snapshot import read_binary, write_binary, binary_path
+from journal_store import JournalStore, read_snapshot, write_snapshot
+
+MIXED = {
+    "names": ["Blue lock", "Ünïcode – title", None],
+    "scores": ["8", "N/A", 8.56],
+    "genres": [["Sports"], "Action, Drama", []],
+    "personal_scores": [6, "7", None],
+    "personal_comments": [2019, "x", ""],
+}
+
+
+def test_mapped_load_returns_the_json_values_and_types(tmp_path):
+    path = str(tmp_path / "anime_stats.txt")
+    digest = write_snapshot(MIXED, path)
+    write_binary(read_snapshot(path, {}), path, ["scores", "personal_scores"], digest)
+
+    mapped, mapped_digest = read_binary(path)
+    assert mapped_digest == digest
+    assert {column: list(values) for column, values in mapped.items()} == MIXED
+    for column, values in MIXED.items():
+        assert [type(value) for value in mapped[column]] == [type(value) for value in values]
+
+
+def test_number_array_uses_nan_for_missing_values(tmp_path):
+    path = str(tmp_path / "anime_stats.txt")
+    write_snapshot(MIXED, path)
+    write_binary(MIXED, path, ["scores"], "")
+
+    numbers, changed = read_binary(path)[0]["scores"].mapped_numbers()
+    assert numbers[0] == 8 and math.isnan(numbers[1]) and numbers[2] == 8.56
+    assert changed == {}
+
+
+def test_stale_copy_is_ignored(tmp_path):
+    path = str(tmp_path / "anime_stats.txt")
+    write_snapshot(MIXED, path)
+    write_binary(MIXED, path, [], "")
+    write_snapshot(dict(MIXED, names=["a", "b", "c"]), path)
+    assert read_binary(path) is None
+
+
+def test_store_loads_identically_with_and_without_the_binary_copy(tmp_path):
+    path = str(tmp_path / "anime_stats.txt")
+    write_snapshot(MIXED, path)
+    store = JournalStore(path, {}, ["names"], number_fields=["scores", "personal_scores"])
+    store.add({"names": "New", "scores": "N/A", "genres": [], "personal_scores": "9", "personal_comments": 2024})
+
+    from_json = store.load()
+    assert os.path.exists(binary_path(path))
+    from_mmap = store.load()
+    assert {c: list(v) for c, v in from_mmap.items()} == {c: list(v) for c, v in from_json.items()}
+
+
+def test_compaction_never_writes_decoded_values_back(tmp_path):
+    path = str(tmp_path / "anime_stats.txt")
+    write_snapshot(MIXED, path)
+    store = JournalStore(path, {}, ["names"], number_fields=["scores", "personal_scores"])
+    store.load()
+    store.load()  # Mapped
+    store.add({"names": "New", "scores": "N/A", "genres": [], "personal_scores": "9", "personal_comments": 1})
+    store.compact()
+
+    snapshot = read_snapshot(path, {})
+    assert snapshot["scores"] == ["8", "N/A", 8.56, "N/A"]
+    assert snapshot["personal_comments"] == [2019, "x", "", 1]
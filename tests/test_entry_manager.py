@@ -0,0 +1,47 @@
+import pytest
+
+import entry_manager
+import media_repository
+from journal_store import JournalStore, write_snapshot
+from media_config import CONFIG
+
+STORED = {
+    "name": ["Album"], "artist": ["Artist"], "genres": [["rap"]], "image_url": ["http://img/old.png"],
+    "personal_score": ["7"], "playcount": ["46,961,202"],
+}
+# An album.search result: no tags and no playcount
+SEARCH_RESULT = {"name": "Album", "artist": "Artist", "url": "http://last.fm/album",
+                 "image": [{"#text": "http://img/new.png", "size": "large"}]}
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    conf = CONFIG["music"]
+    path = str(tmp_path / "music_stats.txt")
+    write_snapshot(STORED, path)
+    store = JournalStore(path, conf["data_structure"], conf["id_fields"], number_fields=conf["number_fields"])
+    repository = media_repository.MediaRepository()
+    monkeypatch.setattr(media_repository, "get_store", lambda media_type: store)
+    monkeypatch.setattr(entry_manager, "get_repository", lambda: repository)
+    monkeypatch.setattr(entry_manager, "peek_details", lambda media_type, item: None)
+    enqueued = []
+    monkeypatch.setattr(entry_manager, "get_enrichment_queue", lambda: type(
+        "Queue", (), {"enqueue": lambda self, *args: enqueued.append(args)})())
+    monkeypatch.setattr(entry_manager.messagebox, "askyesno", lambda *args: True)
+    monkeypatch.setattr(entry_manager.messagebox, "showinfo", lambda *args: None)
+
+    manager = entry_manager.EntryManager(root=None)
+    manager.current_media_type, manager.selected_item, manager.current_personal_score = "music", SEARCH_RESULT, "9"
+    return manager, repository, store, enqueued
+
+
+def test_updating_from_a_search_payload_keeps_stored_values(manager):
+    manager, repository, store, enqueued = manager
+    manager.process_selected_item()
+
+    for data in (repository.get("music"), store.load()):
+        assert list(data["playcount"]) == ["46,961,202"]
+        assert list(data["genres"]) == [["rap"]]
+        assert list(data["personal_score"]) == ["9"]
+        assert list(data["image_url"]) == ["http://img/new.png"]
+    assert len(enqueued) == 1  # The rest arrives with enrichment
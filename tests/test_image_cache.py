@@ -0,0 +1,14 @@
+from PIL import Image
+
+from image_cache import ThumbnailCache
+
+
+def test_overwriting_a_thumbnail_replaces_its_size(tmp_path):
+    cache = ThumbnailCache(str(tmp_path))
+    cache.put("http://example.com/a.png", Image.new("RGB", (10, 10)))
+    cache.put("http://example.com/b.png", Image.new("RGB", (10, 10)))
+    for _ in range(3):
+        cache.put("http://example.com/a.png", Image.effect_noise((40, 40), 50))
+
+    on_disk = sum(path.stat().st_size for path in tmp_path.rglob("*.png"))
+    assert cache._total_bytes == on_disk
@@ -0,0 +1,107 @@
+import json
+
+from journal_store import STALE_SUFFIX, JournalStore, file_digest, write_snapshot
+
+STRUCTURE = {"names": [], "scores": []}
+
+
+def make_store(tmp_path, **kwargs):
+    path = str(tmp_path / "anime_stats.txt")
+    write_snapshot({"names": ["a"], "scores": [1]}, path)
+    return JournalStore(path, STRUCTURE, ["names"], **kwargs)
+
+
+def rows(data):
+    return list(data["names"]), list(data["scores"])
+
+
+def test_journal_replays_add_update_delete(tmp_path):
+    store = make_store(tmp_path)
+    store.add({"names": "b", "scores": 2})
+    store.add({"names": "c", "scores": 3})
+    store.update(0, {"scores": 10})
+    store.delete(1)
+    assert rows(store.load()) == (["a", "c"], [10, 3])
+
+
+def test_compaction_folds_the_journal_into_the_snapshot(tmp_path):
+    store = make_store(tmp_path)
+    store.add({"names": "b", "scores": 2})
+    store.compact()
+
+    with open(store.snapshot_path) as file:
+        assert json.load(file) == {"names": ["a", "b"], "scores": [1, 2]}  # Columns only, as before journals
+    with open(store.journal_path) as file:
+        assert json.loads(file.readline()) == {"op": "snapshot", "digest": file_digest(store.snapshot_path)}
+    assert rows(JournalStore(store.snapshot_path, STRUCTURE, ["names"]).load()) == (["a", "b"], [1, 2])
+
+
+def test_crash_after_snapshot_write_does_not_replay_the_old_journal(tmp_path):
+    store = make_store(tmp_path)
+    store.add({"names": "b", "scores": 2})
+    store.update(0, {"scores": 5})
+    with open(store.journal_path) as file:
+        old_journal = file.read()
+    store.compact()
+    # Simulate a crash between writing the snapshot and starting the new journal
+    with open(store.journal_path, "w") as file:
+        file.write(old_journal)
+
+    reopened = JournalStore(store.snapshot_path, STRUCTURE, ["names"])
+    assert rows(reopened.load()) == (["a", "b"], [5, 2])
+    with open(store.journal_path + STALE_SUFFIX) as file:
+        assert file.read() == old_journal  # Kept aside, not deleted
+    reopened.add({"names": "c", "scores": 3})
+    assert rows(JournalStore(store.snapshot_path, STRUCTURE, ["names"]).load()) == (["a", "b", "c"], [5, 2, 3])
+
+
+def test_append_to_stale_journal_without_load_discards_it_first(tmp_path):
+    store = make_store(tmp_path)
+    store.add({"names": "b", "scores": 2})
+    with open(store.journal_path) as file:
+        old_journal = file.read()
+    store.compact()
+    with open(store.journal_path, "w") as file:
+        file.write(old_journal)
+
+    JournalStore(store.snapshot_path, STRUCTURE, ["names"]).add({"names": "c", "scores": 3})
+    assert rows(JournalStore(store.snapshot_path, STRUCTURE, ["names"]).load()) == (["a", "b", "c"], [1, 2, 3])
+
+
+def test_crash_before_snapshot_write_keeps_the_journal(tmp_path):
+    store = make_store(tmp_path)
+    store.add({"names": "b", "scores": 2})
+    # No compaction happened: the old snapshot and its journal are both intact
+    assert rows(JournalStore(store.snapshot_path, STRUCTURE, ["names"]).load()) == (["a", "b"], [1, 2])
+
+
+def test_torn_final_line_does_not_swallow_the_next_record(tmp_path):
+    store = make_store(tmp_path)
+    store.add({"names": "b", "scores": 2})
+    with open(store.journal_path, "a") as file:
+        file.write(json.dumps({"op": "add", "entry": {"names": "torn", "scores": 9}})[:20])
+
+    reopened = JournalStore(store.snapshot_path, STRUCTURE, ["names"])
+    assert rows(reopened.load()) == (["a", "b"], [1, 2])
+    reopened.add({"names": "c", "scores": 3})
+    assert rows(JournalStore(store.snapshot_path, STRUCTURE, ["names"]).load()) == (["a", "b", "c"], [1, 2, 3])
+
+
+def test_legacy_journal_without_header_is_replayed(tmp_path):
+    store = make_store(tmp_path)
+    with open(store.journal_path, "w") as file:
+        file.write(json.dumps({"op": "add", "entry": {"names": "b", "scores": 2}}) + "\n")
+    assert rows(store.load()) == (["a", "b"], [1, 2])
+
+
+def test_dedupe_and_replace_keep_the_stats_file_format(tmp_path):
+    store = make_store(tmp_path)
+    store.add({"names": "a", "scores": 2})
+    assert store.dedupe() == 1
+    with open(store.snapshot_path) as file:
+        assert json.load(file) == {"names": ["a"], "scores": [2]}
+
+    store.replace({"names": ["x", "y"], "scores": [3, 4]})
+    with open(store.snapshot_path) as file:
+        assert json.load(file) == {"names": ["x", "y"], "scores": [3, 4]}
+    assert rows(JournalStore(store.snapshot_path, STRUCTURE, ["names"]).load()) == (["x", "y"], [3, 4])
@@ -0,0 +1,73 @@
+import pytest
+
+import library_index
+import media_repository
+import text_index
+from journal_store import JournalStore, write_snapshot
+from media_config import CONFIG
+
+ANIME = {
+    "names": ["Naruto", "Naruto Shippuden", "Boruto", "One Piece", "Attack on Titan", "Bleach"],
+    "scores": [8, 8.2, 6, 8.7, 9, 7.9],
+    "genres": [["Action"], ["Action", "Adventure"], ["Action"], ["Adventure", "Comedy"], ["Action", "Drama"], ["Action"]],
+    "personal_scores": [7, 9, 3, 10, 9, 6],
+    "personal_comments": ["2002", "2007", "2017", "1999", "2013", "2004"],
+    "image_url": [""] * 6,
+}
+
+
+@pytest.fixture
+def repository(tmp_path, monkeypatch):
+    conf = CONFIG["anime"]
+    path = str(tmp_path / "anime_stats.txt")
+    write_snapshot(ANIME, path)
+    store = JournalStore(path, conf["data_structure"], conf["id_fields"], number_fields=conf["number_fields"])
+    repository = media_repository.MediaRepository()
+    monkeypatch.setattr(media_repository, "get_store", lambda media_type: store)
+    monkeypatch.setattr(library_index, "get_repository", lambda: repository)
+    monkeypatch.setattr(library_index, "_indexes", {})
+    monkeypatch.setattr(library_index, "_subscribed", False)
+    return repository
+
+
+def titles(repository, rows):
+    names = repository.get("anime")["names"]
+    return [names[row] for _, row in rows]
+
+
+def test_limited_search_is_the_top_of_the_full_ranking():
+    index = text_index.TrigramIndex(["names", "genres"]).build(ANIME)
+    full = index.search("action")
+    assert len(full) == 5
+    assert index.search("action", limit=2) == full[:2]
+    assert [row for _, row in index.search("naruto", rows={1, 3})] == [1]
+
+
+def test_text_query_is_capped_ranked_and_genre_filtered(repository):
+    rows = library_index.query_rows(["anime"], text="naruto", limit=1)
+    assert titles(repository, rows) == ["Naruto"]
+    rows = library_index.query_rows(["anime"], text="naruto", genres=["Adventure"], limit=5)
+    assert titles(repository, rows) == ["Naruto Shippuden"]
+    rows = library_index.query_rows(["anime"], "Personal score", descending=True, text="action", limit=3)
+    assert len(rows) == 3
+    scores = [repository.get("anime")["personal_scores"][row] for _, row in rows]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_background_build_is_redone_when_a_write_lands_meanwhile(repository, monkeypatch):
+    index = library_index.get_library_index("anime")
+    assert not index.text_ready()
+    build = text_index.TrigramIndex.build
+    builds = []
+
+    def build_with_concurrent_write(self, data):
+        builds.append(len(data["names"]))
+        if len(builds) == 1:
+            repository.add("anime", dict(ANIME, names="Naruto the Movie", genres=["Action"]))
+        return build(self, data)
+    monkeypatch.setattr(text_index.TrigramIndex, "build", build_with_concurrent_write)
+
+    library_index.prepare_text_search(["anime"])
+    assert builds == [6, 7]
+    assert library_index.text_search_ready(["anime"])
+    assert "Naruto the Movie" in titles(repository, library_index.query_rows(["anime"], text="naruto movie"))
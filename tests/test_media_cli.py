@@ -0,0 +1,83 @@
+import io
+
+import pytest
+
+import media_cli
+import media_core
+
+RESULTS = [{"title": "First"}, {"title": "Second"}]
+
+
+class FakeRepository:
+    def __init__(self):
+        self.added = []
+
+    def add_many(self, media_type, entries):
+        self.added.extend(entries)
+        return len(entries), 0
+
+
+@pytest.fixture
+def repository(monkeypatch):
+    repository = FakeRepository()
+    monkeypatch.setattr(media_cli, "get_repository", lambda: repository)
+    monkeypatch.setattr(media_core, "search", lambda media_type, query: RESULTS)
+    monkeypatch.setattr(media_core, "format_result", lambda media_type, result: result["title"])
+    monkeypatch.setattr(media_core, "get_details", lambda media_type, result: result)
+    monkeypatch.setattr(media_core, "build_entry",
+                        lambda media_type, details, score: {"names": details["title"], "personal_scores": score})
+    return repository
+
+
+class Terminal(io.StringIO):
+    def isatty(self):
+        return True
+
+
+@pytest.mark.parametrize("pick", ["0", "3", "-1"])
+def test_out_of_range_pick_is_an_error(repository, capsys, pick):
+    assert media_cli.main(["add", "anime", "query", "--score", "8", "--pick", pick]) == 1
+    assert "between 1 and 2" in capsys.readouterr().out
+    assert repository.added == []
+
+
+def test_non_numeric_pick_is_rejected_by_argparse(repository):
+    with pytest.raises(SystemExit):
+        media_cli.main(["add", "anime", "query", "--score", "8", "--pick", "two"])
+
+
+def test_valid_pick_adds_that_result(repository):
+    assert media_cli.main(["add", "anime", "query", "--score", "8", "--pick", "2"]) == 0
+    assert repository.added == [{"names": "Second", "personal_scores": "8"}]
+
+
+@pytest.mark.parametrize("answer, expected", [("x\n", "Please enter a number"), ("", "Please enter a number"),
+                                              ("5\n", "between 1 and 2")])
+def test_bad_interactive_pick_is_an_error(repository, monkeypatch, capsys, answer, expected):
+    monkeypatch.setattr("sys.stdin", Terminal(answer))
+    assert media_cli.main(["add", "anime", "query", "--score", "8"]) == 1
+    assert expected in capsys.readouterr().out
+    assert repository.added == []
+
+
+def test_interactive_pick_adds_that_result(repository, monkeypatch):
+    monkeypatch.setattr("sys.stdin", Terminal("2\n"))
+    assert media_cli.main(["add", "anime", "query", "--score", "8"]) == 0
+    assert repository.added[0]["names"] == "Second"
+
+
+def test_add_without_query_or_id_is_an_error(capsys):
+    assert media_cli.main(["add", "anime", "--score", "8"]) == 1
+    assert "needs a query or --id" in capsys.readouterr().out
+
+
+def test_id_is_rejected_for_music(monkeypatch, capsys):
+    monkeypatch.setattr(media_core, "get_media_details", lambda *args: pytest.fail("TMDB must not be called"))
+    assert media_cli.main(["add", "music", "--id", "5", "--score", "3"]) == 1
+    assert "--id is not supported for music" in capsys.readouterr().out
+
+
+def test_details_by_id_refuses_music(monkeypatch):
+    monkeypatch.setattr(media_core, "get_media_details", lambda *args: pytest.fail("TMDB must not be called"))
+    with pytest.raises(ValueError):
+        media_core.get_details_by_id("music", 5)
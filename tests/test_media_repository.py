@@ -0,0 +1,48 @@
+import sqlite3
+import threading
+
+import pytest
+
+import media_repository
+from journal_store import JournalStore
+from media_config import CONFIG
+from sqlite_store import SQLiteStore
+
+
+@pytest.fixture(params=["journal", "sqlite"])
+def repository(request, tmp_path, monkeypatch):
+    conf = CONFIG["music"]
+    file_path = str(tmp_path / "music_stats.txt")
+    monkeypatch.setitem(conf, "file_path", file_path)
+    if request.param == "journal":
+        store = JournalStore(file_path, conf["data_structure"], conf["id_fields"],
+                             number_fields=conf["number_fields"])
+    else:
+        store = SQLiteStore(sqlite3.connect(str(tmp_path / "media.db")), threading.RLock(), "music")
+    monkeypatch.setattr(media_repository, "get_store", lambda media_type: store)
+    return media_repository.MediaRepository(), store
+
+
+def song(name, artist="Artist", score=5):
+    return {"name": name, "artist": artist, "genres": [], "image_url": "", "personal_score": score, "playcount": 1}
+
+
+def test_duplicate_add_updates_the_existing_row(repository):
+    repo, store = repository
+    repo.add("music", song("One", score=1))
+    repo.add("music", song("Two", score=2))
+    repo.add("music", song(" one ", artist="ARTIST", score=9))
+
+    cached = repo.get("music")
+    stored = store.load()
+    assert list(cached["name"]) == list(stored["name"]) == [" one ", "Two"]
+    assert list(cached["personal_score"]) == list(stored["personal_score"]) == [9, 2]
+
+
+def test_add_many_reports_added_and_updated(repository):
+    repo, store = repository
+    repo.add("music", song("One"))
+    added, updated = repo.add_many("music", [song("Two"), song("One", score=7), song("two", score=8)])
+
+    assert (added, updated) == (1, 2)
+    assert list(repo.get("music")["personal_score"]) == list(store.load()["personal_score"]) == [7, 8]
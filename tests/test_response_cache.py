@@ -0,0 +1,41 @@
+import json
+import os
+import time
+
+from response_cache import ResponseCache
+
+
+def stored_files(cache):
+    return sorted(os.listdir(cache.disk_dir))
+
+
+def test_expired_disk_entry_is_deleted_on_read(tmp_path):
+    cache = ResponseCache("search", ttl=60, disk_dir=str(tmp_path))
+    cache.put(("anime", "naruto"), ["result"])
+    # Age the stored response by two minutes, as if it was written in an earlier session
+    path = cache._disk_path(("anime", "naruto"))
+    with open(path) as file:
+        stored = json.load(file)
+    stored["expires_at"] -= 120
+    with open(path, "w") as file:
+        json.dump(stored, file)
+    past = time.time() - 120
+    os.utime(path, (past, past))
+
+    assert ResponseCache("search", ttl=60, disk_dir=str(tmp_path)).get(("anime", "naruto")) is None
+    assert stored_files(cache) == []
+
+
+def test_disk_tier_is_capped_oldest_first(tmp_path):
+    cache = ResponseCache("details", ttl=3600, disk_dir=str(tmp_path), max_disk_bytes=2000)
+    for number in range(20):
+        cache.put(("movie", number), ["x" * 200])
+        path = cache._disk_path(("movie", number))
+        os.utime(path, (1000 + number, time.time() - 100 + number))
+
+    sizes = sum(os.path.getsize(os.path.join(cache.disk_dir, name)) for name in stored_files(cache))
+    assert sizes <= 2000
+    assert cache._disk_bytes == sizes
+    cache.clear()
+    assert cache.get(("movie", 19)) == ["x" * 200]
+    assert cache.get(("movie", 0)) is None
@@ -0,0 +1,91 @@
+import threading
+import time
+
+import pytest
+
+from single_flight import SingleFlight
+
+WAIT = 5  # Seconds; generous so a slow machine never fails these
+SETTLE = 0.1  # Time given to waiter threads to reach the call in flight
+
+
+def start_flight(flights, fn, waiters):
+    """Run flights.do("key", fn) on a leader thread and, once it is inside fn, on waiter threads.
+
+    Returns (threads, outcomes); each outcome is ("ok", result) or ("error", exception).
+    """
+    outcomes = [None] * (waiters + 1)
+
+    def run(index):
+        try:
+            outcomes[index] = ("ok", flights.do("key", fn))
+        except Exception as e:
+            outcomes[index] = ("error", e)
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(waiters + 1)]
+    threads[0].start()
+    assert fn.started.wait(WAIT)
+    for thread in threads[1:]:
+        thread.start()
+    time.sleep(SETTLE)
+    return threads, outcomes
+
+
+class BlockingCall:
+    """fn that blocks until release() and then returns result or raises error."""
+
+    def __init__(self, result=None, error=None):
+        self.result, self.error = result, error
+        self.started, self._release = threading.Event(), threading.Event()
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        self.started.set()
+        assert self._release.wait(WAIT)
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+    def release(self, threads):
+        self._release.set()
+        for thread in threads:
+            thread.join(WAIT)
+
+
+def test_worker_calls_share_one_execution():
+    flights, fn = SingleFlight(), BlockingCall(result=["shared"])
+    threads, outcomes = start_flight(flights, fn, waiters=3)
+    fn.release(threads)
+
+    assert fn.calls == 1
+    assert outcomes == [("ok", ["shared"])] * 4
+    assert all(result is fn.result for _, result in outcomes)
+
+
+def test_leader_error_reaches_every_waiter_and_is_forgotten():
+    flights, fn = SingleFlight(), BlockingCall(error=ValueError("provider down"))
+    threads, outcomes = start_flight(flights, fn, waiters=2)
+    fn.release(threads)
+
+    assert fn.calls == 1
+    assert outcomes == [("error", fn.error)] * 3
+    # The failure is not remembered: the next call runs afresh
+    retry = BlockingCall(result="recovered")
+    threads, outcomes = start_flight(flights, retry, waiters=0)
+    retry.release(threads)
+    assert outcomes == [("ok", "recovered")]
+
+
+def test_main_thread_never_waits_on_a_call_in_flight():
+    flights, fn = SingleFlight(), BlockingCall(result="slow")
+    threads, outcomes = start_flight(flights, fn, waiters=0)
+    try:
+        assert flights.do("key", lambda: "own fetch") == "own fetch"
+    finally:
+        fn.release(threads)
+    assert outcomes == [("ok", "slow")]
+
+
+def test_main_thread_errors_propagate():
+    with pytest.raises(KeyError):
+        SingleFlight().do("key", {}.__getitem__, "missing")
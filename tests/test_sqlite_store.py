@@ -0,0 +1,80 @@
+import json
+import sqlite3
+import threading
+
+import pytest
+
+from journal_store import write_snapshot
+from media_config import CONFIG
+from sqlite_store import SQLiteStore
+
+
+def song(name, artist="Artist", score=5):
+    return {"name": name, "artist": artist, "genres": ["Rock"], "image_url": "", "personal_score": score,
+            "playcount": 1}
+
+
+@pytest.fixture
+def make_store(tmp_path, monkeypatch):
+    monkeypatch.setitem(CONFIG["music"], "file_path", str(tmp_path / "music_stats.txt"))
+
+    def make(connection=None):
+        return SQLiteStore(connection or sqlite3.connect(str(tmp_path / "media.db")), threading.RLock(), "music")
+    return make
+
+
+def test_upsert_updates_in_place_and_reports_merges(make_store):
+    store = make_store()
+    assert store.add_many([song("One", score=1), song("Two", score=2)]) == 0
+    assert store.write_batch([{"op": "add", "entry": song("ONE", artist="artist", score=9)}]) == 1
+
+    data = store.load()
+    assert data["name"] == ["ONE", "Two"]
+    assert data["personal_score"] == [9, 2]
+
+
+def test_positions_follow_deletes_in_the_middle(make_store):
+    store = make_store()
+    store.add_many([song(name) for name in ["a", "b", "c", "d"]])
+    store.delete(1)
+    store.add(song("e"))
+
+    assert store.load()["name"] == ["a", "c", "d", "e"]
+    assert [store.find(song(name)) for name in ["a", "c", "d", "e", "b"]] == [0, 1, 2, 3, None]
+    store.update(2, {"personal_score": 7})
+    store.delete(0)
+    assert store.load()["name"] == ["c", "d", "e"]
+    assert store.load()["personal_score"] == [5, 7, 5]
+
+
+def test_import_reports_merged_duplicates(tmp_path, make_store):
+    rows = [song("One", score=1), song("Two"), song("one", score=3)]
+    write_snapshot({column: [row[column] for row in rows] for column in rows[0]}, CONFIG["music"]["file_path"])
+    store = make_store()
+
+    assert store.load()["name"] == ["one", "Two"]
+    assert store.load()["personal_score"] == [3, 5]
+    assert store.dedupe() == 1
+    assert store.dedupe() == 0
+
+
+def test_existing_library_gets_positions_in_insertion_order(tmp_path, make_store):
+    connection = sqlite3.connect(str(tmp_path / "media.db"))
+    columns = ", ".join(f'"{column}"' for column in CONFIG["music"]["data_structure"])
+    connection.execute(f'CREATE TABLE "music" (id INTEGER PRIMARY KEY, {columns})')
+    connection.executemany('INSERT INTO "music" (id, name, artist) VALUES (?, ?, ?)',
+                           [(1, "a", "x"), (5, "b", "x"), (9, "c", "x")])
+    store = make_store(connection)
+
+    assert store.load()["name"] == ["a", "b", "c"]
+    assert store.find({"name": "c", "artist": "x"}) == 2
+
+
+def test_export_writes_the_plain_columnar_format(tmp_path, make_store):
+    store = make_store()
+    store.add_many([song("One"), song("Two")])
+    path = str(tmp_path / "export" / "music_stats.txt")
+    store.export_json(path)
+
+    with open(path) as file:
+        assert json.load(file) == {column: list(values) for column, values in store.load().items()}
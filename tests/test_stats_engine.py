@@ -0,0 +1,44 @@
+import pytest
+
+from binary_snapshot import read_binary, write_binary
+from journal_store import apply_record, write_snapshot
+from stats_engine import MediaStats
+
+TV = {
+    "title": ["A", "B", "C"],
+    "genres": [["Drama"], ["Drama", "Crime"], []],
+    "release_date": ["2001-01-01", "", "2010"],
+    "score": [7.0, "8", "N/A"],
+    "personal_score": ["9", 6, None],
+}
+
+
+def test_columns_are_parsed_per_column():
+    summary = MediaStats("tv", {column: list(values) for column, values in TV.items()}).summary()
+
+    assert (summary["entries"], summary["scored"]) == (3, 2)
+    assert summary["mean_personal"] == 7.5
+    assert summary["genres"] == [("Drama", 2, 7.5), ("Crime", 1, 6.0)]
+    assert summary["years"] == [(2001, 1, 9.0), (2010, 1, None)]
+    assert summary["most_underrated"] == [("A", 2.0)]
+    assert summary["most_overrated"] == [("B", -2.0)]
+
+
+def test_mapped_number_columns_match_parsed_ones(tmp_path):
+    path = str(tmp_path / "tv_stats.txt")
+    write_binary(TV, path, ["score", "personal_score"], write_snapshot(TV, path))
+    mapped, _ = read_binary(path)
+    apply_record(mapped, {"op": "update", "index": 2, "entry": {"personal_score": "4"}})
+    apply_record(mapped, {"op": "add", "entry": dict(title="D", genres=[], release_date="", score=5,
+                                                    personal_score=3)})
+    plain = {column: list(values) for column, values in mapped.items()}
+    assert mapped["personal_score"].mapped_numbers() is not None  # Exercises the pre-parsed path
+
+    assert MediaStats("tv", mapped).summary() == MediaStats("tv", plain).summary()
+
+
+def test_ragged_columns_are_rejected():
+    data = {column: list(values) for column, values in TV.items()}
+    data["title"].pop()
+    with pytest.raises(ValueError):
+        MediaStats("tv", data)